@@ -37,5 +37,5 @@ except IOError:
 from gnumeric.workbook import Workbook
 
 
-def load_workbook(filepath):
-    return Workbook.load_workbook(filepath)
+def load_workbook(filepath, *, trust_dimensions=False):
+    return Workbook.load_workbook(filepath, trust_dimensions=trust_dimensions)
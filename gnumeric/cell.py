@@ -17,7 +17,7 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 import datetime
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 
 from lxml import etree
 
@@ -36,33 +36,200 @@ VALUE_TYPE_CELLRANGE = 70
 VALUE_TYPE_ARRAY = 80
 
 
+def decode_cell_element(
+    cell_element,
+) -> Tuple[int, Union[bool, int, float, str, None]]:
+    """
+    Reads the value type and value stored in a `gnm:Cell` element, converting the value into the appropriate Python
+    datatype when possible.  For expressions, the value is the raw text of the element (`None` when the cell only
+    refers to a shared expression by its id).
+
+    Raises `UnrecognizedCellTypeException` if the type of the cell can't be determined.
+    """
+    value = cell_element.text
+    value_type = cell_element.get('ValueType')
+    if value_type is not None:
+        value_type = int(value_type)
+    elif cell_element.get('ExprID') is not None or (
+        value is not None and value.startswith('=')
+    ):
+        value_type = VALUE_TYPE_EXPR
+    else:
+        raise UnrecognizedCellTypeException(
+            'Cell is: "' + str(etree.tostring(cell_element)) + '"'
+        )
+
+    if value_type == VALUE_TYPE_BOOLEAN:
+        value = value.lower() == 'true'
+    elif value_type == VALUE_TYPE_INTEGER:
+        value = int(value)
+    elif value_type == VALUE_TYPE_FLOAT:
+        value = float(value)
+    return value_type, value
+
+
+# How values of the plain Python types are stored: their value type and how to turn them into the element's text
+_VALUE_ENCODERS = {
+    bool: (VALUE_TYPE_BOOLEAN, lambda v: str(v).upper()),
+    int: (VALUE_TYPE_INTEGER, str),
+    float: (VALUE_TYPE_FLOAT, str),
+    str: (VALUE_TYPE_STRING, str),
+}
+
+
+def encode_value(value) -> Tuple[int, Optional[str]]:
+    """
+    Returns the value type and text to store `value` in a new `gnm:Cell` element.  The type is inferred the same way
+    `Cell.set_value` infers it for an empty cell: `bool`, `int`, and `float` values get their own types; `None` and
+    the empty string are `VALUE_TYPE_EMPTY`; strings starting with `=` are `VALUE_TYPE_EXPR`; anything else is stored
+    as a string.
+
+    `Expression` objects can't be encoded without a cell to hold them, so they raise `TypeError`.
+    """
+    encoder = _VALUE_ENCODERS.get(type(value))
+    if encoder is not None:
+        value_type, to_text = encoder
+        if value_type == VALUE_TYPE_STRING:
+            if value == '':
+                return VALUE_TYPE_EMPTY, None
+            elif value[0] == '=':
+                return VALUE_TYPE_EXPR, value
+        return value_type, to_text(value)
+    elif value is None:
+        return VALUE_TYPE_EMPTY, None
+    elif isinstance(value, Expression):
+        raise TypeError("Expression objects can't be encoded without a cell")
+    return VALUE_TYPE_STRING, str(value)
+
+
 class Cell:
-    _instances = {}
+    # A sheet can have a great many cells, so avoid a per-instance `__dict__`.  `__weakref__` lets sheets cache cells
+    # without keeping them alive.
+    __slots__ = (
+        '__cell',
+        '__coordinate',
+        '__worksheet',
+        '__ns',
+        '__cached_value',
+        '__value_type',
+        '__value',
+        '__style_region',
+        '__weakref__',
+    )
 
     _BASE_DATETIME = datetime.datetime(1899, 12, 30)
 
-    def __new__(cls, cell_element, style_region_element, worksheet, ns):
-        key = (cell_element, style_region_element, worksheet)
-        instance = cls._instances.get(key)
-        if not instance:
-            instance = super(Cell, cls).__new__(cls)
-            instance.__cached_value = None
-            instance.__time_cached_value_set = None
-            cls._instances[key] = instance
-        return instance
-
-    def __init__(self, cell_element, style_region_element, worksheet, ns):
+    def __init__(
+        self,
+        cell_element,
+        worksheet,
+        ns,
+        *,
+        coordinate: Optional[RowColReference] = None,
+    ):
+        """
+        Cells should not be created directly; get them from their worksheet (e.g. `Sheet.cell`), which makes sure there
+        is only one `Cell` object per cell element at a time.
+
+        If `cell_element` is `None`, then this is a virtual empty cell at `coordinate`: it has no element in the
+        worksheet until it's given a value.
+        """
         self.__cell = cell_element
-        self.__style_region = style_region_element
+        self.__coordinate = coordinate
         self.__worksheet = worksheet
         self.__ns = ns
+        self.__cached_value = None
+        self.__value_type = None
+        self.__value = None
+        self.__style_region = None
+
+    def __get_style_region(self):
+        """
+        The `gnm:StyleRegion` element covering this cell.  It's looked up the first time it's needed, so cells that are
+        only read for their values never touch the sheet's styles.
+        """
+        if self.__style_region is None:
+            self.__style_region = self.__worksheet._get_cell_style(
+                self.row, self.column
+            )
+        return self.__style_region
 
     def __get_style_element(self):
-        elements = self.__style_region.xpath('./gnm:Style', namespaces=self.__ns)
+        elements = self.__get_style_region().xpath('./gnm:Style', namespaces=self.__ns)
         return elements[0] if elements else None
 
+    def __decode(self) -> None:
+        """
+        Decode the cell element's type and value, unless they've already been decoded since the value was last set.
+        """
+        if self.__cell is None:
+            self.__value_type, self.__value = VALUE_TYPE_EMPTY, None
+        elif self.__value_type is None:
+            self.__value_type, value = decode_cell_element(self.__cell)
+            if self.__value_type == VALUE_TYPE_EXPR:
+                value = Expression(self.__cell.get('ExprID'), self.__worksheet, self)
+            self.__value = value
+
+    def _invalidate_value(self) -> None:
+        """
+        Forget the decoded value, so it's decoded again from the cell element when next needed.  Should not be called
+        directly -- it's called automatically when the cell's element changes.
+        """
+        self.__value_type = None
+        self.__value = None
+
+    def _invalidate_result(self) -> None:
+        """
+        Forget the decoded value and the computed result of the expression, after the worksheet replaced the cell's
+        content.  Should not be called directly -- the worksheet calls this when it rewrites cell elements in bulk.
+        """
+        self._invalidate_value()
+        self.__cached_value = None
+
+    def _bind(self, cell_element) -> None:
+        """
+        Give a virtual cell the element that was just created for it in the worksheet.  Should not be called directly
+        -- the worksheet calls this when it creates an element where a virtual cell is.
+        """
+        self.__cell = cell_element
+        self.__coordinate = None
+        self._invalidate_value()
+
+    def _unbind(self) -> None:
+        """
+        Turn this cell into a virtual empty cell at its current position, after its element was removed from the
+        worksheet.  Should not be called directly -- the worksheet calls this when it removes the cell's element.
+        """
+        self.__coordinate = self.coordinate
+        self.__cell = None
+        self._invalidate_result()
+
+    def _relocate(self, coordinate: RowColReference) -> None:
+        """
+        Move a virtual cell to `coordinate`.  Should not be called directly -- the worksheet calls this when rows or
+        columns are inserted or deleted.
+        """
+        self.__coordinate = coordinate
+        self.__style_region = None
+
+    def _invalidate_style(self) -> None:
+        """
+        Forget the style region found for this cell, so it's looked up again when next needed.  Should not be called
+        directly -- the worksheet calls this when its style regions change.
+        """
+        self.__style_region = None
+
+    @property
+    def is_virtual(self) -> bool:
+        """
+        `True` if this is an empty cell that doesn't exist in the worksheet yet.  It's added to the worksheet once it's
+        given a value.
+        """
+        return self.__cell is None
+
     def __set_expression_id(self, expr_id: str) -> None:
         self.__cell.set('ExprID', expr_id)
+        self._invalidate_value()
 
     @property
     def worksheet(self):
@@ -76,6 +243,8 @@ class Cell:
         """
         The column this cell belongs to (0-indexed).
         """
+        if self.__cell is None:
+            return self.__coordinate.col
         return int(self.__cell.get('Col'))
 
     @property
@@ -83,6 +252,8 @@ class Cell:
         """
         The row this cell belongs to (0-indexed).
         """
+        if self.__cell is None:
+            return self.__coordinate.row
         return int(self.__cell.get('Row'))
 
     @property
@@ -98,7 +269,7 @@ class Cell:
         Returns the raw value stored in the cell.  The text will be `None` if the cell is empty.
         :return: str or `None`
         """
-        return self.__cell.text
+        return None if self.__cell is None else self.__cell.text
 
     @property
     def value_type(self) -> int:
@@ -114,15 +285,8 @@ class Cell:
          - VALUE_TYPE_CELLRANGE = 70
          - VALUE_TYPE_ARRAY = 80
         """
-        value_type = self.__cell.get('ValueType')
-        if value_type is not None:
-            return int(value_type)
-        elif self.__cell.get('ExprID') is not None or self.text.startswith('='):
-            return VALUE_TYPE_EXPR
-        else:
-            raise UnrecognizedCellTypeException(
-                'Cell is: "' + str(etree.tostring(self.__cell)) + '"'
-            )
+        self.__decode()
+        return self.__value_type
 
     def is_datetime(self) -> bool:
         return (
@@ -146,24 +310,14 @@ class Cell:
         If the cell is an expression: If `compute_expression` is True, the the result of the expression
         is returned, otherwise an Expression object is returned.
         """
-        value = self.text
-        if self.value_type == VALUE_TYPE_BOOLEAN:
-            return value.lower() == 'true'
-        elif self.value_type == VALUE_TYPE_INTEGER:
-            return int(value)
-        elif self.value_type == VALUE_TYPE_FLOAT:
-            return float(value)
-        elif self.value_type == VALUE_TYPE_EXPR:
-            expression = Expression(self.__cell.get('ExprID'), self.__worksheet, self)
-            if not compute_expression:
-                return expression
-            else:
-                if self.__cached_value is None:
-                    self.__cached_value = 0
-                    self.__cached_value = expression.value
-                return self.__cached_value
+        self.__decode()
+        if self.__value_type == VALUE_TYPE_EXPR and compute_expression:
+            if self.__cached_value is None:
+                self.__cached_value = 0
+                self.__cached_value = self.__value.value
+            return self.__cached_value
         else:
-            return value
+            return self.__value
 
     def set_value(self, value, *, value_type: str = 'infer') -> None:
         """
@@ -210,6 +364,16 @@ class Cell:
         elif value_type == 'keep':
             value_type = self.value_type
 
+        if self.__cell is None:
+            if value_type == VALUE_TYPE_EMPTY:
+                return
+            # Creating the cell in the worksheet binds its new element to this cell, unless the worksheet no longer
+            # knows this virtual cell (e.g. its row was deleted), in which case the value goes to the worksheet's cell
+            cell = self.__worksheet.cell(self.row, self.column)
+            if cell is not self:
+                cell.set_value(value, value_type=value_type)
+                return
+
         if value_type == VALUE_TYPE_BOOLEAN:
             self.__cell.text = str(bool(value)).upper()
         elif value_type == VALUE_TYPE_EMPTY:
@@ -242,7 +406,13 @@ class Cell:
             self.__cell.text = str(value)
 
         self.__set_type(value_type)
-        self.__cached_value = self.get_value(compute_expression=True)
+        self._invalidate_value()
+        self.__worksheet._update_cell(self.__cell)
+        if self.__worksheet._in_batch:
+            # The expression is computed when it's needed, after the rest of the batch is written
+            self.__cached_value = None
+        else:
+            self.__cached_value = self.get_value(compute_expression=True)
 
     value = property(
         get_value,
@@ -268,7 +438,9 @@ class Cell:
         The format string used to format the text in the cell for display.  This is the "Number Format" in Gnumeric.
         """
         return str(
-            self.__style_region.xpath('./gnm:Style/@Format', namespaces=self.__ns)[0]
+            self.__get_style_region().xpath(
+                './gnm:Style/@Format', namespaces=self.__ns
+            )[0]
         )
 
     def __str__(self) -> str:
@@ -283,12 +455,10 @@ class Cell:
         )
 
     def __eq__(self, other) -> bool:
-        return (
-            isinstance(other, Cell)
-            and self.__worksheet == other.__worksheet
-            and self.row == other.row
-            and self.column == other.column
-        )
+        # The worksheet hands out a single Cell per position (a cell whose element is removed becomes a virtual cell at
+        # the same position), so a cell is only equal to itself.  Equality and hashing then survive rows and columns
+        # being inserted or deleted, and a cell whose row was deleted isn't equal to the cell that moved into its place.
+        return self is other
 
     def __hash__(self) -> int:
-        return hash(self.__cell)
+        return id(self)
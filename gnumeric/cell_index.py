@@ -0,0 +1,386 @@
+"""
+Gnumeric-py: Reading and writing gnumeric files with python
+Copyright (C) 2017 Michael Lipschultz
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Generator, List, Optional, Set, Tuple
+
+from gnumeric.cell import VALUE_TYPE_EMPTY, VALUE_TYPE_EXPR
+
+
+def value_type_of(element) -> Optional[int]:
+    """
+    The value type (one of the `VALUE_TYPE_*` constants) of the cell element, without decoding its value.  A cell with
+    no value type is an expression if it has an expression id or its text starts with `=`, and empty if it has no
+    text.  Returns `None` when the type can't be determined.
+    """
+    value_type = element.get('ValueType')
+    if value_type is not None:
+        return int(value_type)
+
+    text = element.text
+    if element.get('ExprID') is not None or (text is not None and text.startswith('=')):
+        return VALUE_TYPE_EXPR
+    elif not text:
+        return VALUE_TYPE_EMPTY
+    return None
+
+
+class CellIndex:
+    """
+    An in-memory index over the `gnm:Cell` elements of a worksheet, so questions about the cells can be answered
+    without scanning the whole sheet.  It holds:
+
+     - the element at each (row, column);
+     - for every row, the sorted columns that have an element, and for every column, the sorted rows, so a single row
+       or column (or a rectangle) can be read on its own;
+     - the same sorted positions restricted to the cells holding content, which give the bounds of the sheet and of
+       each row and column;
+     - the positions of the cells grouped by value type, so all cells of a type (e.g. every expression, or every empty
+       cell) can be found without looking at the others.
+
+    The index is built with a single pass over the `gnm:Cells` element and must be kept up to date by the worksheet
+    whenever a cell element is added, removed, or has its content changed.
+    """
+
+    def __init__(self, cells_element, ns):
+        self.__cells = cells_element
+        self.__elements: Dict[Tuple[int, int], object] = {}
+        self.__row_columns: Dict[int, List[int]] = {}
+        self.__column_rows: Dict[int, List[int]] = {}
+        self.__rows: List[int] = []
+        self.__columns: List[int] = []
+        self.__types: Dict[Tuple[int, int], Optional[int]] = {}
+        self.__type_positions: Dict[Optional[int], Set[Tuple[int, int]]] = {}
+        self.__content_row_columns: Dict[int, List[int]] = {}
+        self.__content_column_rows: Dict[int, List[int]] = {}
+        self.__content_rows: List[int] = []
+        self.__content_columns: List[int] = []
+
+        for element in cells_element.iterchildren('{%s}Cell' % ns['gnm']):
+            row, col = self.__coordinate(element)
+            if (row, col) in self.__elements:
+                continue
+            self.__elements[(row, col)] = element
+            self.__row_columns.setdefault(row, []).append(col)
+            self.__column_rows.setdefault(col, []).append(row)
+            value_type = self.__add_type(row, col, element)
+            if value_type != VALUE_TYPE_EMPTY:
+                self.__content_row_columns.setdefault(row, []).append(col)
+                self.__content_column_rows.setdefault(col, []).append(row)
+
+        for lines in (
+            self.__row_columns,
+            self.__column_rows,
+            self.__content_row_columns,
+            self.__content_column_rows,
+        ):
+            for line in lines.values():
+                line.sort()
+        self.__rows = sorted(self.__row_columns)
+        self.__columns = sorted(self.__column_rows)
+        self.__content_rows = sorted(self.__content_row_columns)
+        self.__content_columns = sorted(self.__content_column_rows)
+
+    @staticmethod
+    def __coordinate(element) -> Tuple[int, int]:
+        return int(element.get('Row')), int(element.get('Col'))
+
+    @staticmethod
+    def __slice(line: List[int], min_idx: int, max_idx: Optional[int]) -> List[int]:
+        """
+        Returns the part of the sorted `line` that is between `min_idx` and `max_idx` (inclusive).  If `max_idx` is
+        `None`, then everything from `min_idx` onwards is returned.
+        """
+        start = bisect_left(line, min_idx)
+        end = len(line) if max_idx is None else bisect_right(line, max_idx)
+        return line[start:end]
+
+    @property
+    def cells_element(self):
+        """
+        The `gnm:Cells` element this index was built from.
+        """
+        return self.__cells
+
+    def __len__(self) -> int:
+        return len(self.__elements)
+
+    def get(self, row: int, col: int) -> Optional[object]:
+        """
+        Returns the cell element at (`row`, `col`), or `None` if there isn't one.
+        """
+        return self.__elements.get((row, col))
+
+    @property
+    def min_row(self) -> int:
+        """
+        The first row holding content, or -1 if no cell has content.
+        """
+        return self.__content_rows[0] if self.__content_rows else -1
+
+    @property
+    def max_row(self) -> int:
+        """
+        The last row holding content, or -1 if no cell has content.
+        """
+        return self.__content_rows[-1] if self.__content_rows else -1
+
+    @property
+    def min_column(self) -> int:
+        """
+        The first column holding content, or -1 if no cell has content.
+        """
+        return self.__content_columns[0] if self.__content_columns else -1
+
+    @property
+    def max_column(self) -> int:
+        """
+        The last column holding content, or -1 if no cell has content.
+        """
+        return self.__content_columns[-1] if self.__content_columns else -1
+
+    def min_column_in_row(self, row: int) -> int:
+        """
+        The first column in `row` holding content, or -1 if the row has no content.
+        """
+        line = self.__content_row_columns.get(row)
+        return line[0] if line else -1
+
+    def max_column_in_row(self, row: int) -> int:
+        """
+        The last column in `row` holding content, or -1 if the row has no content.
+        """
+        line = self.__content_row_columns.get(row)
+        return line[-1] if line else -1
+
+    def min_row_in_column(self, col: int) -> int:
+        """
+        The first row in `col` holding content, or -1 if the column has no content.
+        """
+        line = self.__content_column_rows.get(col)
+        return line[0] if line else -1
+
+    def max_row_in_column(self, col: int) -> int:
+        """
+        The last row in `col` holding content, or -1 if the column has no content.
+        """
+        line = self.__content_column_rows.get(col)
+        return line[-1] if line else -1
+
+    def empty_elements(self) -> List[object]:
+        """
+        Returns the cell elements that hold no content.
+        """
+        return self.elements_of_type(VALUE_TYPE_EMPTY)
+
+    def elements_of_type(self, value_type: Optional[int]) -> List[object]:
+        """
+        Returns the cell elements whose value type is `value_type` (one of the `VALUE_TYPE_*` constants, or `None` for
+        cells whose type can't be determined), in no particular order.
+        """
+        return [
+            self.__elements[coordinate]
+            for coordinate in self.__type_positions.get(value_type, ())
+        ]
+
+    def row(
+        self, row: int, min_col: int = 0, max_col: Optional[int] = None
+    ) -> List[object]:
+        """
+        Returns the cell elements in `row`, sorted by column.  Only columns between `min_col` and `max_col` (inclusive)
+        are included; if `max_col` is `None`, then there is no upper bound.
+        """
+        columns = self.__slice(self.__row_columns.get(row, []), min_col, max_col)
+        return [self.__elements[(row, col)] for col in columns]
+
+    def column(
+        self, col: int, min_row: int = 0, max_row: Optional[int] = None
+    ) -> List[object]:
+        """
+        Returns the cell elements in `col`, sorted by row.  Only rows between `min_row` and `max_row` (inclusive) are
+        included; if `max_row` is `None`, then there is no upper bound.
+        """
+        rows = self.__slice(self.__column_rows.get(col, []), min_row, max_row)
+        return [self.__elements[(row, col)] for row in rows]
+
+    def range(
+        self,
+        min_row: int,
+        min_col: int,
+        max_row: int,
+        max_col: int,
+        *,
+        include_empty: bool = True,
+        row_major: bool = True,
+    ) -> Generator[object, None, None]:
+        """
+        Yields the cell elements inside the (inclusive) rectangle from (`min_row`, `min_col`) to (`max_row`,
+        `max_col`).  If `row_major` is True, then cells are yielded row by row, sorted by column within each row;
+        otherwise, column by column, sorted by row within each column.  Empty cells are skipped unless `include_empty`
+        is True.
+
+        Only the rows (or columns) with cells inside the rectangle are visited, so the cost depends on the number of
+        cells in the rectangle rather than in the sheet.
+        """
+        if row_major:
+            lines, keys = (
+                (self.__row_columns, self.__rows)
+                if include_empty
+                else (self.__content_row_columns, self.__content_rows)
+            )
+            min_key, max_key, min_idx, max_idx = min_row, max_row, min_col, max_col
+        else:
+            lines, keys = (
+                (self.__column_rows, self.__columns)
+                if include_empty
+                else (self.__content_column_rows, self.__content_columns)
+            )
+            min_key, max_key, min_idx, max_idx = min_col, max_col, min_row, max_row
+
+        for key in self.__slice(keys, min_key, max_key):
+            line = lines.get(key)
+            if line is None:
+                continue
+            for idx in self.__slice(line, min_idx, max_idx):
+                element = self.__elements.get((key, idx) if row_major else (idx, key))
+                if element is not None:
+                    yield element
+
+    def next_element(self, row: int, col: int) -> Optional[object]:
+        """
+        Returns the first cell element after (`row`, `col`) in row-major order, or `None` if there isn't one.
+        """
+        columns = self.__row_columns.get(row)
+        if columns:
+            idx = bisect_right(columns, col)
+            if idx < len(columns):
+                return self.__elements[(row, columns[idx])]
+
+        idx = bisect_right(self.__rows, row)
+        if idx < len(self.__rows):
+            next_row = self.__rows[idx]
+            return self.__elements[(next_row, self.__row_columns[next_row][0])]
+        return None
+
+    def add(self, element) -> None:
+        """
+        Add `element` to the index.  The element's `Row` and `Col` attributes determine its position.
+        """
+        row, col = self.__coordinate(element)
+        if (row, col) in self.__elements:
+            self.remove(self.__elements[(row, col)])
+
+        self.__elements[(row, col)] = element
+        self.__insert(self.__row_columns, self.__rows, row, col)
+        self.__insert(self.__column_rows, self.__columns, col, row)
+        if self.__add_type(row, col, element) != VALUE_TYPE_EMPTY:
+            self.__add_content(row, col)
+
+    def remove(self, element) -> None:
+        """
+        Remove `element` from the index.  Nothing happens if the element isn't indexed.
+        """
+        row, col = self.__coordinate(element)
+        if self.__elements.get((row, col)) is not element:
+            return
+
+        del self.__elements[(row, col)]
+        self.__discard(self.__row_columns, row, col, self.__rows)
+        self.__discard(self.__column_rows, col, row, self.__columns)
+        if self.__remove_type(row, col) != VALUE_TYPE_EMPTY:
+            self.__remove_content(row, col)
+
+    def update(self, element) -> None:
+        """
+        Re-check the value type of the indexed `element` and whether it holds content.  Call this after changing the
+        element's value.
+        """
+        row, col = self.__coordinate(element)
+        if self.__elements.get((row, col)) is not element:
+            return
+
+        old_type = self.__types[(row, col)]
+        if value_type_of(element) == old_type:
+            return
+
+        self.__remove_type(row, col)
+        new_type = self.__add_type(row, col, element)
+        if old_type == VALUE_TYPE_EMPTY:
+            self.__add_content(row, col)
+        elif new_type == VALUE_TYPE_EMPTY:
+            self.__remove_content(row, col)
+
+    def __add_type(self, row: int, col: int, element) -> Optional[int]:
+        """
+        Record the value type of `element`, which is at (`row`, `col`), and return it.
+        """
+        value_type = value_type_of(element)
+        self.__types[(row, col)] = value_type
+        self.__type_positions.setdefault(value_type, set()).add((row, col))
+        return value_type
+
+    def __remove_type(self, row: int, col: int) -> Optional[int]:
+        """
+        Forget the value type recorded for (`row`, `col`) and return it.
+        """
+        value_type = self.__types.pop((row, col))
+        positions = self.__type_positions[value_type]
+        positions.remove((row, col))
+        if not positions:
+            del self.__type_positions[value_type]
+        return value_type
+
+    def __add_content(self, row: int, col: int) -> None:
+        self.__insert(self.__content_row_columns, self.__content_rows, row, col)
+        self.__insert(self.__content_column_rows, self.__content_columns, col, row)
+
+    def __remove_content(self, row: int, col: int) -> None:
+        self.__discard(self.__content_row_columns, row, col, self.__content_rows)
+        self.__discard(self.__content_column_rows, col, row, self.__content_columns)
+
+    @staticmethod
+    def __insert(
+        lines: Dict[int, List[int]], keys: Optional[List[int]], key: int, idx: int
+    ) -> None:
+        """
+        Add `idx` to the sorted line stored under `key`.  If the line is new and `keys` is given, then `key` is added to
+        the sorted `keys`.
+        """
+        if key not in lines:
+            lines[key] = []
+            if keys is not None:
+                insort(keys, key)
+        insort(lines[key], idx)
+
+    @staticmethod
+    def __discard(
+        lines: Dict[int, List[int]],
+        key: int,
+        idx: int,
+        keys: Optional[List[int]] = None,
+    ) -> None:
+        """
+        Remove `idx` from the sorted line stored under `key`, dropping the line once it's empty.  When the line is
+        dropped and `keys` is given, then `key` is removed from the sorted `keys`.
+        """
+        line = lines[key]
+        del line[bisect_left(line, idx)]
+        if not line:
+            del lines[key]
+            if keys is not None:
+                del keys[bisect_left(keys, key)]
@@ -0,0 +1,103 @@
+"""
+Gnumeric-py: Reading and writing gnumeric files with python
+Copyright (C) 2017 Michael Lipschultz
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from typing import Generator, Tuple
+
+from gnumeric.utils import coordinate_to_spreadsheet
+
+
+class CellRange:
+    """
+    A rectangular block of cells in a worksheet, e.g. from `ws['A1:D10']` or `ws[0:10, 0:4]`.
+
+    The range is a view: nothing is read from the worksheet until it's iterated, and every iteration reads the cells
+    as they are at that point.  Cells that don't exist are returned as virtual empty cells (see `Cell.is_virtual`).
+    """
+
+    def __init__(
+        self, worksheet, start_row: int, start_col: int, end_row: int, end_col: int
+    ):
+        """
+        Ranges should not be created directly; get them by indexing the worksheet with a range.
+        """
+        self.__worksheet = worksheet
+        self.__start_row = start_row
+        self.__start_col = start_col
+        self.__end_row = end_row
+        self.__end_col = end_col
+
+    @property
+    def worksheet(self):
+        """
+        The worksheet this range belongs to.
+        """
+        return self.__worksheet
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        The (number of rows, number of columns) in the range.
+        """
+        return (
+            self.__end_row - self.__start_row + 1,
+            self.__end_col - self.__start_col + 1,
+        )
+
+    def rows(self) -> Generator[Tuple, None, None]:
+        """
+        Yields the cells in the range one row at a time, as a tuple of cells ordered by column.
+        """
+        return self.__worksheet.iter_rows(
+            self.__start_row, self.__end_row, self.__start_col, self.__end_col
+        )
+
+    def columns(self) -> Generator[Tuple, None, None]:
+        """
+        Yields the cells in the range one column at a time, as a tuple of cells ordered by row.
+        """
+        return self.__worksheet.iter_cols(
+            self.__start_col, self.__end_col, self.__start_row, self.__end_row
+        )
+
+    def values(self) -> Generator[Tuple, None, None]:
+        """
+        Yields the values in the range one row at a time, as a tuple of values ordered by column.  Empty cells have a
+        value of `None`.
+        """
+        return self.__worksheet.iter_rows(
+            self.__start_row,
+            self.__end_row,
+            self.__start_col,
+            self.__end_col,
+            values_only=True,
+        )
+
+    def __iter__(self):
+        return self.rows()
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __str__(self) -> str:
+        return '%s:%s' % (
+            coordinate_to_spreadsheet(self.__start_row, self.__start_col),
+            coordinate_to_spreadsheet(self.__end_row, self.__end_col),
+        )
+
+    def __repr__(self) -> str:
+        return 'CellRange[%s, ws="%s"]' % (str(self), self.__worksheet.title)
@@ -1,13 +1,18 @@
 import math
 import re
-from typing import Set, Union
+from typing import Callable, Optional, Set, Tuple, Union
 
 from lark import Lark, Transformer, v_args
 from lark.exceptions import UnexpectedCharacters, VisitError
 
 from gnumeric.evaluation_errors import EvaluationError, ExpressionEvaluationException
 from gnumeric.formula_functions import mathematics, statistics
-from gnumeric.utils import column_from_spreadsheet, row_from_spreadsheet
+from gnumeric.utils import (
+    column_from_spreadsheet,
+    column_to_spreadsheet,
+    row_from_spreadsheet,
+    row_to_spreadsheet,
+)
 
 function_map = {
     'abs': abs,
@@ -47,7 +52,7 @@ class CellReference:
         if not self.row_is_fixed:
             row += offset_row
 
-        return sheet.cell(row, col, create=True)
+        return sheet._virtual_cell(row, col)
 
     @classmethod
     def create_from_cell_reference(cls, formula_cell, sheet, ss_col, ss_row):
@@ -311,3 +316,94 @@ def evaluate(expression: str, cell) -> Union[str, int, float, EvaluationError]:
 def get_referenced_cells(expression: str, cell) -> Set:
     _, references = _full_evaluation(expression, cell)
     return references
+
+
+# A string literal (left untouched) or a cell reference or range, optionally on another sheet
+_REFERENCE_RE = re.compile(
+    r'"(?:[^"\\]|\\.)*"'
+    r"|(?<![\w.$'])(?P<sheet>(?:'[^']+'|[A-Za-z_][\w.]*)!)?"
+    r'(?P<col>\$?[A-Za-z]{1,3})(?P<row>\$?\d{1,5})'
+    r'(?::(?P<end_col>\$?[A-Za-z]{1,3})(?P<end_row>\$?\d{1,5}))?(?![\w(!])'
+)
+
+
+def map_references(
+    expression: str,
+    fn: Callable[[Optional[str], int, int, bool, bool], Optional[Tuple[int, int]]],
+    range_fn: Optional[
+        Callable[
+            [Optional[str], int, int, int, int],
+            Optional[Tuple[int, int, int, int]],
+        ]
+    ] = None,
+) -> str:
+    """
+    Rewrite every cell reference in `expression`.  `fn` is called with the reference's sheet name (`None` if it's on
+    the expression's own sheet), its 0-indexed row and column, and whether the row and the column are absolute.  It
+    returns the new (row, column), or `None` to replace the reference with `#REF!`.
+
+    A range ('A1:B5') is rewritten as a whole.  If `range_fn` is given, then it's called with the range's sheet name
+    and its first row, first column, last row, and last column, and returns the new bounds in the same order, or `None`
+    to replace the range with `#REF!`.  Otherwise, `fn` is called for both ends of the range (with the range's sheet
+    name), and the range becomes `#REF!` if either end does.  The ends keep whether their rows and columns are
+    absolute.
+
+    String literals in the expression are left untouched.
+    """
+
+    def to_text(col, row, new_col, new_row):
+        return column_to_spreadsheet(new_col, col.startswith('$')) + row_to_spreadsheet(
+            new_row, row.startswith('$')
+        )
+
+    def replace(match):
+        if match.group('col') is None:
+            return match.group(0)
+
+        sheet, col, row, end_col, end_row = match.group(
+            'sheet', 'col', 'row', 'end_col', 'end_row'
+        )
+        sheet_name = None if sheet is None else sheet[:-1].strip("'")
+        start = row_from_spreadsheet(row), column_from_spreadsheet(col)
+        if end_col is None:
+            new_start = fn(sheet_name, *start, row.startswith('$'), col.startswith('$'))
+            if new_start is None:
+                return '#REF!'
+            return (sheet or '') + to_text(col, row, new_start[1], new_start[0])
+
+        end = row_from_spreadsheet(end_row), column_from_spreadsheet(end_col)
+        if range_fn is not None:
+            bounds = range_fn(sheet_name, *start, *end)
+            new_start, new_end = (
+                (None, None) if bounds is None else (bounds[:2], bounds[2:])
+            )
+        else:
+            new_start = fn(sheet_name, *start, row.startswith('$'), col.startswith('$'))
+            new_end = fn(
+                sheet_name, *end, end_row.startswith('$'), end_col.startswith('$')
+            )
+        if new_start is None or new_end is None:
+            return '#REF!'
+        return (
+            (sheet or '')
+            + to_text(col, row, new_start[1], new_start[0])
+            + ':'
+            + to_text(end_col, end_row, new_end[1], new_end[0])
+        )
+
+    return _REFERENCE_RE.sub(replace, expression)
+
+
+def translate_references(expression: str, row_offset: int, col_offset: int) -> str:
+    """
+    Rewrite `expression` as it would be written in a cell `row_offset` rows and `col_offset` columns away: relative
+    references move by the offset and absolute references stay put.  References that would move off the sheet become
+    `#REF!`.
+    """
+
+    def translate(sheet, row, col, row_fixed, col_fixed):
+        row = row if row_fixed else row + row_offset
+        col = col if col_fixed else col + col_offset
+        return (row, col) if row >= 0 and col >= 0 else None
+
+    return map_references(expression, translate)
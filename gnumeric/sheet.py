@@ -16,6 +16,10 @@ You should have received a copy of the GNU General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
+import threading
+import weakref
+from contextlib import contextmanager
+from copy import deepcopy
 from itertools import product
 from operator import attrgetter
 from typing import (
@@ -24,6 +28,7 @@ from typing import (
     Generator,
     Iterable,
     List,
+    NamedTuple,
     Optional,
     Sequence,
     Tuple,
@@ -33,66 +38,136 @@ from typing import (
 from lxml import etree
 
 from gnumeric import cell
+from gnumeric.cell_index import CellIndex
+from gnumeric.cell_range import CellRange
+from gnumeric.evaluation_errors import EvaluationError
+from gnumeric.expression_evaluation import map_references, translate_references
 from gnumeric.exceptions import UnsupportedOperationException
-from gnumeric.utils import RowColReference, coordinate_from_spreadsheet
+from gnumeric.style_index import StyleIndex
+from gnumeric.utils import (
+    RowColReference,
+    coordinate_from_spreadsheet,
+    coordinate_to_spreadsheet,
+    range_from_spreadsheet,
+)
 
 NEW_CELL = b"""<?xml version="1.0" encoding="UTF-8"?><gnm:ROOT xmlns:gnm="http://www.gnumeric.org/v10.dtd">
 <gnm:Cell Row="%(row)a" Col="%(col)a" ValueType="%(value_type)a"/>
 </gnm:ROOT>"""
 
+NEW_STYLE_REGION = b"""<?xml version="1.0" encoding="UTF-8"?><gnm:ROOT xmlns:gnm="http://www.gnumeric.org/v10.dtd">
+<gnm:StyleRegion startCol="%(start_col)a" startRow="%(start_row)a" endCol="%(end_col)a" endRow="%(end_row)a">
+  <gnm:Style HAlign="GNM_HALIGN_GENERAL" VAlign="GNM_VALIGN_BOTTOM" WrapText="0" ShrinkToFit="0" Rotation="0" Shade="0" Indent="0" Locked="1" Hidden="0" Fore="0:0:0" Back="FFFF:FFFF:FFFF" PatternColor="0:0:0" Format="General">
+    <gnm:Font Unit="10" Bold="0" Italic="0" Underline="0" StrikeThrough="0" Script="0">Sans</gnm:Font>
+  </gnm:Style>
+</gnm:StyleRegion>
+</gnm:ROOT>"""
+
 SHEET_TYPE_REGULAR = None
 SHEET_TYPE_OBJECT = 'object'
 
 
-MaxMinFunction = Callable[[Iterable], int]
 Cell = cell.Cell
 
 
-class Sheet:
-    __EMPTY_CELL_XPATH_SELECTOR = f'@ValueType="{cell.VALUE_TYPE_EMPTY}" or (not(@ValueType) and not(@ExprID) and string-length(text())=0)'
+class CellTypeMasks(NamedTuple):
+    """
+    Boolean arrays, the same shape as the values returned by `Sheet.to_numpy`, marking what each cell holds.  A
+    formula cell is also marked by the kind of value its result is.
+    """
+
+    empty: object
+    string: object
+    error: object
+    formula: object
 
-    def __init__(self, sheet_name_element, sheet_element, workbook):
+
+class Sheet:
+    def __init__(
+        self,
+        sheet_name_element,
+        sheet_element,
+        workbook,
+        *,
+        trust_dimensions: bool = False,
+    ):
+        """
+        :param trust_dimensions: If `True`, then `max_row` and `max_column` are read from the `gnm:MaxRow` and
+            `gnm:MaxCol` elements Gnumeric stores in the sheet, without looking at any cells, until the sheet's cells
+            are changed.
+        """
         self.__sheet_name = sheet_name_element
         self.__sheet = sheet_element
         self.__workbook = workbook
+        self.__trust_dimensions = trust_dimensions
+        self.__cell_index = None
+        self.__style_index = None
+        self.__cell_cache = weakref.WeakValueDictionary()
+        self.__virtual_cells = weakref.WeakValueDictionary()
+        self.__cell_cache_lock = threading.Lock()
+        self.__batch_depth = 0
 
     def __get_cells(self):
         return self.__sheet.find('gnm:Cells', self.__workbook._ns)
 
-    def __get_empty_cells(self):
-        all_cells = self.__get_cells()
-        return all_cells.xpath(
-            f'./gnm:Cell[{self.__EMPTY_CELL_XPATH_SELECTOR}]',
-            namespaces=self.__workbook._ns,
-        )
-
-    def __get_non_empty_cells(self):
-        all_cells = self.__get_cells()
-        return all_cells.xpath(
-            f'./gnm:Cell[not({self.__EMPTY_CELL_XPATH_SELECTOR})]',
-            namespaces=self.__workbook._ns,
-        )
+    def __get_cell_index(self) -> CellIndex:
+        """
+        Returns the (row, col) -> element index for this sheet, building it on first use.
+        """
+        if self.__cell_index is None:
+            self.__cell_index = CellIndex(self.__get_cells(), self.__workbook._ns)
+        return self.__cell_index
 
     def __get_cell_element(self, row: int, col: int):
-        cells = self.__get_cells()
-        return cells.find(f'gnm:Cell[@Row="{row}"][@Col="{col}"]', self.__workbook._ns)
+        return self.__get_cell_index().get(row, col)
+
+    def __get_line_elements(
+        self, rc: str, idx: int, min_cr: int = 0, max_cr: Optional[int] = None
+    ) -> List:
+        """
+        Returns the cell elements in a single row or column, sorted by their position within it.
 
-    def __get_expression_id_cells(self):
-        all_cells = self.__get_cells()
-        return all_cells.xpath('./gnm:Cell[@ExprID]', namespaces=self.__workbook._ns)
+        :param rc: `str` indicating whether `idx` is a `"row"` or a `"column"`.
+        :param min_cr: The first column (for a row) or row (for a column) to include.
+        :param max_cr: The last column (for a row) or row (for a column) to include.  `None` means no upper bound.
+        """
+        cell_index = self.__get_cell_index()
+        if rc == 'row':
+            return cell_index.row(idx, min_cr, max_cr)
+        else:
+            return cell_index.column(idx, min_cr, max_cr)
+
+    def __get_expression_id_cells(self) -> List:
+        """
+        Returns the cell elements that share an expression by its id, in row-major order (the order Gnumeric stores
+        them in).
+        """
+        elements = [
+            element
+            for element in self.__get_cell_index().elements_of_type(
+                cell.VALUE_TYPE_EXPR
+            )
+            if element.get('ExprID') is not None
+        ]
+        return sorted(elements, key=lambda e: (int(e.get('Row')), int(e.get('Col'))))
 
     def __get_styles(self):
         return self.__sheet.xpath('./gnm:Styles', namespaces=self.__workbook._ns)[0]
 
-    def __get_cell_style(self, cell_element):
-        row = cell_element.get('Row')
-        col = cell_element.get('Col')
-        return self.__get_styles().xpath(
-            './gnm:StyleRegion['
-            + f'@startCol<="{col}" and "{col}"<=@endCol '
-            + f'and @startRow<="{row}" and "{row}"<=@endRow]',
-            namespaces=self.__workbook._ns,
-        )[0]
+    def __get_style_index(self) -> StyleIndex:
+        """
+        Returns the style region index for this sheet, building it on first use.
+        """
+        if self.__style_index is None:
+            self.__style_index = StyleIndex(self.__get_styles(), self.__workbook._ns)
+        return self.__style_index
+
+    def _get_cell_style(self, row: int, col: int):
+        """
+        Returns the `gnm:StyleRegion` element covering the cell at (`row`, `col`).  Should not be called directly --
+        cells call this when they first need their style.
+        """
+        return self.__get_style_index().find(row, col)
 
     def __create_and_get_new_cell(self, row_idx: int, col_idx: int) -> cell.Cell:
         """
@@ -102,17 +177,117 @@ class Sheet:
             NEW_CELL
             % {b'row': row_idx, b'col': col_idx, b'value_type': cell.VALUE_TYPE_EMPTY}
         ).getchildren()[0]
-        cells = self.__get_cells()
-        cells.append(new_cell)
+        self.__add_cell_element(new_cell)
         return new_cell
 
-    def __cell_element_to_class(self, element) -> Cell:
-        return cell.Cell(
-            element, self.__get_cell_style(element), self, self.__workbook._ns
+    def __add_cell_element(self, element) -> None:
+        """
+        Adds a new cell element to the worksheet and its index.  If a virtual cell was handed out for the element's
+        position, then it's bound to the element.
+        """
+        cell_index = self.__get_cell_index()
+        cell_index.cells_element.append(element)
+        self.__register_cell_element(element)
+
+    def __register_cell_element(self, element) -> None:
+        """
+        Adds a cell element that was just appended to the `gnm:Cells` element to the index, binding any virtual cell
+        handed out for its position.
+
+        Unless it's the last cell in row-major order, the element is moved in front of the cell that follows it, so the
+        cells stay in the order Gnumeric writes them in.
+        """
+        cell_index = self.__get_cell_index()
+        next_element = cell_index.next_element(
+            int(element.get('Row')), int(element.get('Col'))
         )
+        if next_element is not None:
+            next_element.addprevious(element)
+
+        cell_index.add(element)
+        if not self.__virtual_cells:
+            return
+
+        with self.__cell_cache_lock:
+            virtual_cell = self.__virtual_cells.pop(
+                (int(element.get('Row')), int(element.get('Col'))), None
+            )
+            if virtual_cell is not None:
+                virtual_cell._bind(element)
+                self.__cell_cache[element] = virtual_cell
+
+    def __cell_element_to_class(self, element) -> Cell:
+        """
+        Returns the `Cell` for `element`.  While a `Cell` is in use elsewhere, the same object is returned for its
+        element; once nothing refers to it, it's dropped from the sheet's cache.
+        """
+        with self.__cell_cache_lock:
+            cell_obj = self.__cell_cache.get(element)
+            if cell_obj is None:
+                cell_obj = cell.Cell(element, self, self.__workbook._ns)
+                self.__cell_cache[element] = cell_obj
+            return cell_obj
 
     __ce2c = __cell_element_to_class
 
+    def __get_cell_or_virtual(self, row_idx: int, col_idx: int) -> Cell:
+        """
+        Returns the cell at (`row_idx`, `col_idx`) if it exists, otherwise a virtual empty cell that's only added to the
+        worksheet once it's given a value.  While a virtual cell is in use elsewhere, the same object is returned for
+        its position.
+        """
+        element = self.__get_cell_element(row_idx, col_idx)
+        if element is not None:
+            return self.__ce2c(element)
+
+        with self.__cell_cache_lock:
+            cell_obj = self.__virtual_cells.get((row_idx, col_idx))
+            if cell_obj is None:
+                cell_obj = cell.Cell(
+                    None,
+                    self,
+                    self.__workbook._ns,
+                    coordinate=RowColReference(row_idx, col_idx),
+                )
+                self.__virtual_cells[(row_idx, col_idx)] = cell_obj
+            return cell_obj
+
+    @contextmanager
+    def batch(self):
+        """
+        A context manager that groups many writes together: `with ws.batch(): ...`.
+
+        Inside the block, setting a cell to an expression doesn't compute the expression right away, as `Cell.set_value`
+        otherwise does, so expressions aren't computed from values that are about to be overwritten.  When the
+        outermost batch ends, the results computed for expressions in this sheet are forgotten, so they're computed
+        from the final values when next needed.  Batches can be nested.
+        """
+        self.__batch_depth += 1
+        try:
+            yield self
+        finally:
+            self.__batch_depth -= 1
+            if self.__batch_depth == 0:
+                self.__end_batch()
+
+    def __end_batch(self) -> None:
+        """
+        Forget the results computed for expressions, since the values they depend on may have changed in the batch.
+        """
+        with self.__cell_cache_lock:
+            cells = list(self.__cell_cache.values())
+        for cell_obj in cells:
+            if cell_obj.value_type == cell.VALUE_TYPE_EXPR:
+                cell_obj._invalidate_result()
+
+    @property
+    def _in_batch(self) -> bool:
+        """
+        Whether a batch of writes is in progress (see `batch`).  Should not be used directly -- cells check this when
+        their value is set.
+        """
+        return self.__batch_depth > 0
+
     @property
     def workbook(self):
         """
@@ -129,6 +304,7 @@ class Sheet:
     def set_title(self, title: str) -> None:
         sheet_name = self.__sheet.find('gnm:Name', self.__workbook._ns)
         sheet_name.text = self.__sheet_name.text = title
+        self.__workbook._sheets_changed()
 
     title = property(get_title, set_title)
 
@@ -139,6 +315,7 @@ class Sheet:
         """
         self.__sheet_name.getparent().remove(self.__sheet_name)
         self.__sheet.getparent().remove(self.__sheet)
+        self.__workbook._sheets_changed()
 
     @property
     def type(self) -> str:
@@ -149,21 +326,26 @@ class Sheet:
         """
         return self.__sheet_name.get('{%s}SheetType' % (self.__workbook._ns['gnm']))
 
-    def __maxmin_rc(self, rc: str, mm_fn: MaxMinFunction) -> int:
+    def __stored_max_rc(self, rc: str) -> int:
+        """
+        The max row or column that Gnumeric stored in the sheet when it was saved.
+        :param rc: `str` indiciating whether this is for `"column"` or `"row"`.
+        """
+        element = 'gnm:MaxCol' if rc == 'column' else 'gnm:MaxRow'
+        return int(self.__sheet.find(element, self.__workbook._ns).text)
+
+    def __maxmin_rc(self, rc: str, mm: str) -> int:
         """
         The abstracted method for `max_column`, `max_row`, `min_column`, and `min_row`
         :param rc: `str` indiciating whether this is for `"column"` or `"row"`.
-        :param mm_fn: The function for whether to get the max or the min.
+        :param mm: `str` indicating whether to get the `"max"` or the `"min"`.
         """
         if self.type == SHEET_TYPE_OBJECT:
             raise UnsupportedOperationException('Chartsheet does not have ' + rc)
 
-        content_cells = self.__get_non_empty_cells()
-        return (
-            -1
-            if len(content_cells) == 0
-            else mm_fn(getattr(self.__ce2c(c), rc) for c in content_cells)
-        )
+        if mm == 'max' and self.__trust_dimensions:
+            return self.__stored_max_rc(rc)
+        return getattr(self.__get_cell_index(), mm + '_' + rc)
 
     @property
     def max_column(self) -> int:
@@ -171,7 +353,7 @@ class Sheet:
         The maximum column that still holds data.  Raises UnsupportedOperationException when the sheet is a chartsheet.
         :return: `int`
         """
-        return self.__maxmin_rc('column', max)
+        return self.__maxmin_rc('column', 'max')
 
     @property
     def max_row(self) -> int:
@@ -179,7 +361,7 @@ class Sheet:
         The maximum row that still holds data.  Raises UnsupportedOperationException when the sheet is a chartsheet.
         :return: `int`
         """
-        return self.__maxmin_rc('row', max)
+        return self.__maxmin_rc('row', 'max')
 
     @property
     def min_column(self) -> int:
@@ -187,7 +369,7 @@ class Sheet:
         The minimum column that still holds data.  Raises UnsupportedOperationException when the sheet is a chartsheet.
         :return: `int`
         """
-        return self.__maxmin_rc('column', min)
+        return self.__maxmin_rc('column', 'min')
 
     @property
     def min_row(self) -> int:
@@ -195,51 +377,48 @@ class Sheet:
         The minimum row that still holds data.  Raises UnsupportedOperationException when the sheet is a chartsheet.
         :return: `int`
         """
-        return self.__maxmin_rc('row', min)
+        return self.__maxmin_rc('row', 'min')
 
-    def __maxmin_rc_in_cr(self, cr: str, mm_fn: MaxMinFunction, idx: int) -> int:
+    def __maxmin_rc_in_cr(self, cr: str, mm: str, idx: int) -> int:
         """
         The abstracted method for `max_column_in_row` and `max_row_in_column`.
         :param cr: `str` indicating whether to search the `"column"` or `"row"` for the max row/col.
-        :param mm_fn: The function for whether to get the max or the min.
+        :param mm: `str` indicating whether to get the `"max"` or the `"min"`.
         :param idx: `int` indicating which column/row to search through
         """
         rc = 'column' if cr == 'row' else 'row'
         if self.type == SHEET_TYPE_OBJECT:
             raise UnsupportedOperationException('Chartsheet does not have ' + rc)
 
-        content_cells = self.__get_non_empty_cells()
-        content_cells = [self.__ce2c(c) for c in content_cells]
-        content_cells = [getattr(c, rc) for c in content_cells if getattr(c, cr) == idx]
-        return -1 if len(content_cells) == 0 else mm_fn(content_cells)
+        return getattr(self.__get_cell_index(), f'{mm}_{rc}_in_{cr}')(idx)
 
     def max_column_in_row(self, row: int) -> int:
         """
         Get the last column in `row` that has a value.  Returns -1 if the row is empty.  Raises
         UnsupportedOperationException when the sheet is a chartsheet.
         """
-        return self.__maxmin_rc_in_cr('row', max, row)
+        return self.__maxmin_rc_in_cr('row', 'max', row)
 
     def max_row_in_column(self, column: int) -> int:
         """
         Get the last row in `column` that has a value.  Returns -1 if the column is empty.  Raises
         UnsupportedOperationException when the sheet is a chartsheet.
         """
-        return self.__maxmin_rc_in_cr('column', max, column)
+        return self.__maxmin_rc_in_cr('column', 'max', column)
 
     def min_column_in_row(self, row: int) -> int:
         """
         Get the first column in `row` that has a value.  Returns -1 if the row is empty.  Raises
         UnsupportedOperationException when the sheet is a chartsheet.
         """
-        return self.__maxmin_rc_in_cr('row', min, row)
+        return self.__maxmin_rc_in_cr('row', 'min', row)
 
     def min_row_in_column(self, column: int) -> int:
         """
         Get the first row in `column` that has a value.  Returns -1 if the column is empty.  Raises
         UnsupportedOperationException when the sheet is a chartsheet.
         """
-        return self.__maxmin_rc_in_cr('column', min, column)
+        return self.__maxmin_rc_in_cr('column', 'min', column)
 
     def __max_allowed_rc(self, rc: str) -> int:
         """
@@ -305,13 +484,9 @@ class Sheet:
         """
         return self.__is_valid_rc('row', row)
 
-    def cell(self, row_idx: int, col_idx: int, *, create: bool = True) -> Cell:
+    def __check_cell_bounds(self, row_idx: int, col_idx: int) -> None:
         """
-        Returns a Cell object for the cell at the specific row and column.
-
-        If the cell does not exist, then an empty cell will be created and returned, unless `create` is `False` (in
-        which case, `IndexError` is raised).  Note that the cell will not be added to the worksheet until it is not
-        empty (since Gnumeric does not seem to store empty cells).
+        Raises `IndexError` if (`row_idx`, `col_idx`) is outside of the worksheet.
         """
         if not self.is_valid_row(row_idx):
             raise IndexError(
@@ -322,6 +497,15 @@ class Sheet:
                 f'Column ({col_idx}) for cell is out of allowed bounds of [0, {self.max_allowed_column}]'
             )
 
+    def cell(self, row_idx: int, col_idx: int, *, create: bool = True) -> Cell:
+        """
+        Returns a Cell object for the cell at the specific row and column.
+
+        If the cell does not exist, then an empty cell will be created and returned, unless `create` is `False` (in
+        which case, `IndexError` is raised).  Note that the cell will not be added to the worksheet until it is not
+        empty (since Gnumeric does not seem to store empty cells).
+        """
+        self.__check_cell_bounds(row_idx, col_idx)
         cell_found = self.__get_cell_element(row_idx, col_idx)
         if cell_found is None:
             if create:
@@ -331,30 +515,282 @@ class Sheet:
 
         return self.__ce2c(cell_found)
 
-    def __getitem__(self, idx: Union[RowColReference, str]) -> Cell:
-        if isinstance(idx, tuple) and len(idx) == 2:
+    def _virtual_cell(self, row_idx: int, col_idx: int) -> Cell:
+        """
+        Returns the Cell at the specific row and column.  If the cell does not exist, then a virtual empty cell is
+        returned instead of creating one; it's only added to the worksheet once it's given a value.  Should not be
+        called directly -- it's used when evaluating expressions.
+        """
+        self.__check_cell_bounds(row_idx, col_idx)
+        return self.__get_cell_or_virtual(row_idx, col_idx)
+
+    def __getitem__(
+        self, idx: Union[RowColReference, str, Tuple[slice, slice]]
+    ) -> Union[Cell, CellRange]:
+        """
+        Returns the cell at a single coordinate (`ws['A1']` or `ws[0, 0]`), or a `CellRange` view of a rectangular
+        block of cells (`ws['A1:D10']` or `ws[0:10, 0:4]`, with 0-based, half-open slices).
+        """
+        bounds = self.__to_range(idx)
+        if bounds is not None:
+            return CellRange(self, *bounds)
+        elif isinstance(idx, tuple) and len(idx) == 2:
             return self.cell(*idx)
         elif isinstance(idx, str):
             return self.cell(*coordinate_from_spreadsheet(idx))
         raise IndexError(f'Unrecognized index: {idx!r}')
 
-    def cell_text(self, row_idx: int, col_idx: int) -> str:
+    def __slice_bounds(self, idx: slice, max_allowed: int) -> Tuple[int, int]:
+        """
+        Convert a row or column slice into its first and last (inclusive) index.  A missing start is the first row or
+        column and a missing stop is the last allowed one.
+        """
+        if idx.step not in (None, 1):
+            raise IndexError(f'Slices with a step are not supported: {idx!r}')
+        start = 0 if idx.start is None else idx.start
+        stop = max_allowed + 1 if idx.stop is None else idx.stop
+        return start, stop - 1
+
+    def __to_range(
+        self, idx: Union[str, Tuple[slice, slice]]
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Convert a range index -- an 'A1:D10'-style range or a (row slice, column slice) tuple with 0-based, half-open
+        slices -- into (start_row, start_col, end_row, end_col).  Returns `None` if `idx` isn't a range.
+        """
+        if isinstance(idx, str) and ':' in idx:
+            (start_row, start_col), (end_row, end_col) = range_from_spreadsheet(idx)
+        elif (
+            isinstance(idx, tuple)
+            and len(idx) == 2
+            and isinstance(idx[0], slice)
+            and isinstance(idx[1], slice)
+        ):
+            start_row, end_row = self.__slice_bounds(idx[0], self.max_allowed_row)
+            start_col, end_col = self.__slice_bounds(idx[1], self.max_allowed_column)
+        else:
+            return None
+
+        self.__check_cell_bounds(start_row, start_col)
+        self.__check_cell_bounds(end_row, end_col)
+        if end_row < start_row or end_col < start_col:
+            raise IndexError(f'Range is empty: {idx!r}')
+        return start_row, start_col, end_row, end_col
+
+    def __range_bounds(
+        self, cell_range: Union[str, RowColReference, Tuple[slice, slice]]
+    ) -> Tuple[int, int, int, int]:
         """
-        Returns the cell's text at the specific row and column.
+        Like `__to_range`, but a single coordinate is accepted as a range of one cell.
+        """
+        bounds = self.__to_range(cell_range)
+        if bounds is None:
+            row, col = self.__to_coordinate(cell_range)
+            self.__check_cell_bounds(row, col)
+            bounds = row, col, row, col
+        return bounds
 
-        If the cell does not exist, then it will raise an IndexError.
+    def __setitem__(self, idx: Union[RowColReference, str, Tuple[slice, slice]], value):
         """
-        return self.cell(row_idx, col_idx, create=False).text
+        Set a single cell (`ws['A1'] = 5` or `ws[0, 0] = 5`) or a rectangular block of cells.  A block is given as an
+        'A1:D10'-style range or as a (row slice, column slice) tuple, e.g. `ws[0:10, 0:4]`, and its value is a list of
+        rows, an iterable of rows, or a 2D NumPy array.  The block is written with `write_rows`.
 
-    def __sort_cell_elements(self, cell_elements, row_major: bool) -> List[Cell]:
+        Raises `ValueError` if the shape of the value doesn't match the shape of the range; nothing is written then.
         """
-        Sort the cells according to indices.  If `row_major` is True, then sorting will occur by row first, then within
-        each row, columns will be sorted.  If `row_major` is False, then the opposite will happen: first sort by column,
-        then by row within each column.
+        bounds = self.__to_range(idx)
+        if bounds is None:
+            self[idx].value = value
+            return
+
+        start_row, start_col, end_row, end_col = bounds
+        n_rows, n_cols = end_row - start_row + 1, end_col - start_col + 1
+        if hasattr(value, 'tolist'):
+            value = value.tolist()
+        if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+            raise ValueError(
+                f'Expected rows of values for the {n_rows}x{n_cols} range {idx!r}, got {value!r}'
+            )
+
+        rows = []
+        for row in value:
+            if isinstance(row, (str, bytes)) or not isinstance(row, Iterable):
+                raise ValueError(
+                    f'Expected rows of values for the {n_rows}x{n_cols} range {idx!r}, got a row of {row!r}'
+                )
+            row = list(row)
+            if len(row) != n_cols:
+                raise ValueError(
+                    f'Row {len(rows)} has {len(row)} values, but the range {idx!r} has {n_cols} columns'
+                )
+            rows.append(row)
+            if len(rows) > n_rows:
+                break
+
+        if len(rows) != n_rows:
+            raise ValueError(
+                f'Got {"more than " if len(rows) > n_rows else ""}{len(rows)} rows, but the range {idx!r} has '
+                f'{n_rows} rows'
+            )
+        self.write_rows(rows, start=RowColReference(start_row, start_col))
+
+    def write_rows(
+        self,
+        rows: Iterable[Iterable],
+        start: Union[str, RowColReference, Cell] = RowColReference(0, 0),
+    ) -> None:
+        """
+        Write the values in `rows` into the worksheet, one row after another, with the first value of the first row
+        going into `start` (an 'A1'-style coordinate, a (row, col) tuple, or a Cell).
+
+        Value types are inferred as in `Cell.set_value`.  `None` and empty strings leave the cell empty.  Cells that
+        don't exist yet are written straight into the worksheet, without creating a `Cell` object for them or
+        computing their expressions; existing cells and `Expression` objects are set through `Cell.set_value`.
+
+        Raises `IndexError` if a value would land outside of the worksheet.  Rows before the offending one are already
+        written.
+        """
+        start_row, start_col = self.__to_coordinate(start)
+        encode_value = cell.encode_value
+        self.__write_rows(
+            rows, start_row, start_col, lambda value, row, col: encode_value(value)
+        )
+
+    def __write_rows(
+        self,
+        rows: Iterable[Iterable],
+        start_row: int,
+        start_col: int,
+        encode: Callable[[object, int, int], Tuple[int, Optional[str]]],
+    ) -> None:
+        """
+        The abstracted method for `write_rows` and `from_numpy`.
+
+        :param encode: Called with a value and its (row, column) offset from the start when the value goes into a new
+            cell; returns the value type and text for the cell element, as `cell.encode_value` does.
+        """
+        self.__check_cell_bounds(start_row, start_col)
+        max_allowed_row = self.max_allowed_row
+        max_allowed_col = self.max_allowed_column
+
+        cell_index = self.__get_cell_index()
+        cells_element = cell_index.cells_element
+        cell_tag = '{%s}Cell' % self.__workbook._ns['gnm']
+
+        self.__trust_dimensions = False
+        for row_offset, row in enumerate(rows):
+            row_idx = start_row + row_offset
+            row = list(row)
+            if row_idx > max_allowed_row:
+                raise IndexError(
+                    f'Row ({row_idx}) for cell is out of allowed bounds of [0, {max_allowed_row}]'
+                )
+            elif start_col + len(row) - 1 > max_allowed_col:
+                raise IndexError(
+                    f'Column ({start_col + len(row) - 1}) for cell is out of allowed bounds of [0, {max_allowed_col}]'
+                )
+
+            for col_offset, value in enumerate(row):
+                col_idx = start_col + col_offset
+                element = cell_index.get(row_idx, col_idx)
+                if element is not None:
+                    self.__ce2c(element).set_value(value)
+                    continue
+                elif isinstance(value, cell.Expression):
+                    self.cell(row_idx, col_idx).set_value(value)
+                    continue
+
+                value_type, text = encode(value, row_offset, col_offset)
+                if value_type == cell.VALUE_TYPE_EMPTY:
+                    continue
+
+                element = etree.SubElement(
+                    cells_element, cell_tag, Row=str(row_idx), Col=str(col_idx)
+                )
+                if value_type != cell.VALUE_TYPE_EXPR:
+                    element.set('ValueType', str(value_type))
+                element.text = text
+                self.__register_cell_element(element)
+
+    def from_numpy(
+        self,
+        array,
+        top_left: Union[str, RowColReference, Cell] = 'A1',
+        *,
+        nan_as_empty: bool = True,
+    ) -> None:
+        """
+        Write a 2D NumPy array into the worksheet, with `array[0, 0]` going into `top_left` (an 'A1'-style coordinate,
+        a (row, col) tuple, or a Cell).
+
+        Boolean, integer, and floating point arrays are stored as `VALUE_TYPE_BOOLEAN`, `VALUE_TYPE_INTEGER`, and
+        `VALUE_TYPE_FLOAT` cells, with the type chosen once for the whole array and the numbers formatted by NumPy in
+        one go.  Other arrays (e.g. object or string arrays) have each value's type inferred as in `write_rows`.  If
+        `nan_as_empty` is True, then NaN values leave the cell empty.
+
+        Raises `ValueError` if `array` isn't 2D, and `IndexError` as in `write_rows`.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError('Sheet.from_numpy requires NumPy to be installed') from e
+
+        array = np.asarray(array)
+        if array.ndim != 2:
+            raise ValueError(f'Expected a 2D array, got {array.ndim} dimensions')
+
+        values = array.tolist()
+        kind = array.dtype.kind
+        if kind in 'biuf':
+            value_type = {
+                'b': cell.VALUE_TYPE_BOOLEAN,
+                'i': cell.VALUE_TYPE_INTEGER,
+                'u': cell.VALUE_TYPE_INTEGER,
+                'f': cell.VALUE_TYPE_FLOAT,
+            }[kind]
+            texts = (
+                np.where(array, 'TRUE', 'FALSE') if kind == 'b' else array.astype(str)
+            ).tolist()
+            if kind == 'f' and nan_as_empty:
+                for row, col in zip(*np.nonzero(np.isnan(array))):
+                    values[row][col] = None
+
+            def encode(value, row, col):
+                if value is None:
+                    return cell.VALUE_TYPE_EMPTY, None
+                return value_type, texts[row][col]
+        else:
+            # NumPy scalars (e.g. in object arrays) are converted to Python values, so their types can be inferred
+            def to_python(value):
+                if isinstance(value, np.generic):
+                    value = value.item()
+                if nan_as_empty and isinstance(value, float) and value != value:
+                    return None
+                return value
+
+            values = [[to_python(v) for v in row] for row in values]
+            encode_value = cell.encode_value
+
+            def encode(value, row, col):
+                return encode_value(value)
 
-        :returns: A list of Cell objects
+        start_row, start_col = self.__to_coordinate(top_left)
+        self.__write_rows(values, start_row, start_col, encode)
+
+    def append(self, row: Iterable) -> None:
+        """
+        Write the values in `row` into the row after the last row holding content, starting at the first column.  See
+        `write_rows` for how the values are written.
+        """
+        self.write_rows([row], start=RowColReference(self.max_row + 1, 0))
+
+    def cell_text(self, row_idx: int, col_idx: int) -> str:
         """
-        return self.__sort_cells([self.__ce2c(c) for c in cell_elements], row_major)
+        Returns the cell's text at the specific row and column.
+
+        If the cell does not exist, then it will raise an IndexError.
+        """
+        return self.cell(row_idx, col_idx, create=False).text
 
     def __sort_cells(self, cells: Sequence[Cell], row_major: bool) -> List[Cell]:
         """
@@ -367,6 +803,68 @@ class Sheet:
         )
         return sorted(cells, key=key_fn)
 
+    def __to_coordinate(
+        self, coordinate: Union[str, RowColReference, Cell]
+    ) -> RowColReference:
+        """
+        Convert an 'A1'-style coordinate, a (row, col) tuple, or a Cell into a (row, col) tuple.
+        """
+        if isinstance(coordinate, Cell):
+            return coordinate.coordinate
+        elif isinstance(coordinate, str):
+            return coordinate_from_spreadsheet(coordinate)
+        return RowColReference(*coordinate)
+
+    def __to_bounds(
+        self,
+        start: Optional[Union[str, RowColReference, Cell]],
+        end: Optional[Union[str, RowColReference, Cell]],
+    ) -> Tuple[int, int, int, int]:
+        """
+        Convert the `start` and `end` of a range into (start_row, start_col, end_row, end_col).  A missing `start` is
+        the first cell of the sheet and a missing `end` is the last allowed cell.
+        """
+        start_row, start_column = (
+            (0, 0) if start is None else self.__to_coordinate(start)
+        )
+        end_row, end_column = (
+            (self.max_allowed_row, self.max_allowed_column)
+            if end is None
+            else self.__to_coordinate(end)
+        )
+        return start_row, start_column, end_row, end_column
+
+    def iter_cells(
+        self,
+        start: Optional[Union[str, RowColReference, Cell]] = None,
+        end: Optional[Union[str, RowColReference, Cell]] = None,
+        *,
+        include_empty: bool = False,
+        order: str = 'row',
+    ) -> Generator[Cell, None, None]:
+        """
+        Yield the existing cells within the (inclusive) range from `start` to `end`.  `start` and `end` are given as in
+        `get_cell_collection`.
+
+        If `order` is `"row"` (default), then cells are yielded row by row, with columns in order within each row.  If
+        `order` is `"column"`, then the opposite happens: column by column, with rows in order within each column.
+
+        If `include_empty` is False (default), then only cells with content are yielded.  If `include_empty` is True,
+        then empty cells that have been created are yielded too.
+
+        Cells are found through the sheet's cell index, so only cells inside the range are looked at.
+        """
+        start_row, start_column, end_row, end_column = self.__to_bounds(start, end)
+        for element in self.__get_cell_index().range(
+            start_row,
+            start_column,
+            end_row,
+            end_column,
+            include_empty=include_empty,
+            row_major=order != 'column',
+        ):
+            yield self.__ce2c(element)
+
     def get_cell_collection(
         self,
         start: Optional[Union[str, RowColReference, Cell]] = None,
@@ -386,53 +884,34 @@ class Sheet:
 
         If `include_empty` is False (default), then only cells with content will be included.  If `include_empty` is
         True, then empty cells that have been created will be included.  To get all empty cells, including those not
-        already created, set `create_cells` to True.
+        already created, set `create_cells` to True.  Cells that don't exist yet are returned as virtual empty cells
+        (see `Cell.is_virtual`), which are only added to the worksheet once they're given a value.
 
         Use `sort` to specify whether the cells should be sorted.  If `False` (default), then no sorting will take
         place.  If `sort` is `"row"`, then sorting will occur by row first, then by column within each row.  If `sort`
         is `"column"`, then the opposite will happen: first sort by column, then by row within each column.
-        """
-        if include_empty:
-            cells = self.__get_cells()
-        else:
-            cells = self.__get_non_empty_cells()
-
-        cells = [self.__ce2c(c) for c in cells]
-
-        if start is None:
-            start = (0, 0)
-        elif isinstance(start, Cell):
-            start = (start.row, start.column)
-        elif isinstance(start, str):
-            start = coordinate_from_spreadsheet(start)
-
-        if end is None:
-            end = (self.max_allowed_row, self.max_allowed_column)
-        elif isinstance(end, Cell):
-            end = (end.row, end.column)
-        elif isinstance(end, str):
-            end = coordinate_from_spreadsheet(end)
-
-        start_row, start_column = start
-        end_row, end_column = end
-        cells = [
-            c
-            for c in cells
-            if start_column <= c.column <= end_column and start_row <= c.row <= end_row
-        ]
 
+        To go through the cells without building a list, use `iter_cells`.
+        """
+        start_row, start_column, end_row, end_column = self.__to_bounds(start, end)
         if create_cells:
-            already_created_cells = {(c.row, c.column) for c in cells}
-            for row, col in product(
-                range(start_row, end_row + 1), range(start_column, end_column + 1)
-            ):
-                if (row, col) not in already_created_cells:
-                    cells.append(self.cell(row, col, create=True))
-
-        if sort:
-            return self.__sort_cells(cells, sort == 'row')
-        else:
-            return cells
+            rows = range(start_row, end_row + 1)
+            columns = range(start_column, end_column + 1)
+            if sort == 'column':
+                positions = ((row, col) for col in columns for row in rows)
+            else:
+                positions = product(rows, columns)
+            return [self.__get_cell_or_virtual(row, col) for row, col in positions]
+
+        order = 'column' if sort == 'column' else 'row'
+        return list(
+            self.iter_cells(
+                (start_row, start_column),
+                (end_row, end_column),
+                include_empty=include_empty,
+                order=order,
+            )
+        )
 
     def __get_rc(
         self, rc: str, idx: int, min_cr: int, max_cr: Optional[int], create_cells: bool
@@ -443,8 +922,6 @@ class Sheet:
         :param rc: `str` indiciating whether this is for `"column"` or `"row"`.
         """
         cr = 'row' if rc == 'column' else 'column'
-        rc_attr = rc[:3].title()
-        cr_attr = cr[:3].title()
         if not self.__is_valid_rc(rc, idx):
             raise IndexError(
                 rc.title()
@@ -477,32 +954,22 @@ class Sheet:
                 + ']'
             )
         elif max_cr is None:
-            max_cr = self.__maxmin_rc_in_cr(rc, max, idx)
+            max_cr = self.__maxmin_rc_in_cr(rc, 'max', idx)
             if max_cr == -1:
                 max_cr = self.__max_allowed_rc(cr)
 
-        existing_cells = self.__get_cells().xpath(
-            './gnm:Cell[@'
-            + rc_attr
-            + '="'
-            + str(idx)
-            + '" and "'
-            + str(min_cr)
-            + '"<=@'
-            + cr_attr
-            + ' and @'
-            + cr_attr
-            + '<="'
-            + str(max_cr)
-            + '"]',
-            namespaces=self.__workbook._ns,
-        )
-        cells = self.__sort_cell_elements(existing_cells, False)
+        cells = [
+            self.__ce2c(c) for c in self.__get_line_elements(rc, idx, min_cr, max_cr)
+        ]
 
         if create_cells:
             cell_map = dict([(getattr(c, cr), c) for c in cells])
             return (
-                cell_map[i] if i in cell_map else self.cell(i, idx)
+                cell_map[i]
+                if i in cell_map
+                else self.__get_cell_or_virtual(
+                    *((idx, i) if rc == 'row' else (i, idx))
+                )
                 for i in range(min_cr, max_cr + 1)
             )
         else:
@@ -523,9 +990,9 @@ class Sheet:
         `max_row` defaults to `None`, meaning go to the last cell with a value in the column, but if the column is
         empty, then go to the last allowed row.  These bounds are inclusive.
 
-        If `create_cells` is `True`, then any cells in the column that don't exist, will be created.  If `False` (the
-        default), then only already-existing cells will be returned.  Note that existing cells that are empty will be
-        returned if `create_cells` is `False`.
+        If `create_cells` is `True`, then any cells in the column that don't exist will be returned as virtual empty
+        cells (see `Cell.is_virtual`).  If `False` (the default), then only already-existing cells will be returned.
+        Note that existing cells that are empty will be returned if `create_cells` is `False`.
 
         Raises `IndexError` if `column` is outside of the valid range for columns, or if `min_row` or `max_row` is
         outside the valid range for rows.
@@ -548,9 +1015,9 @@ class Sheet:
         defaults to `None`, meaning go to the last cell with a value in the row, but if the row is empty, then go to the
         last allowed column.  These bounds are inclusive.
 
-        If `create_cells` is `True`, then any cells in the row that don't exist, will be created.  If `False` (the
-        default), then only already-existing cells will be returned.  Note that existing cells that are empty will be
-        returned if `create_cells` is `False`.
+        If `create_cells` is `True`, then any cells in the row that don't exist will be returned as virtual empty cells
+        (see `Cell.is_virtual`).  If `False` (the default), then only already-existing cells will be returned.  Note
+        that existing cells that are empty will be returned if `create_cells` is `False`.
 
         Raises `IndexError` if `row` is outside of the valid range for rows, or if `min_col` or `max_col` is outside
         the valid range for columns.
@@ -558,6 +1025,344 @@ class Sheet:
         """
         return self.__get_rc('row', row, min_col, max_col, create_cells)
 
+    def __line_value(self, element):
+        """
+        The value of a cell element, as `Cell.value` would return it.  A `Cell` is only created for expressions.
+        """
+        value_type, value = cell.decode_cell_element(element)
+        if value_type == cell.VALUE_TYPE_EXPR:
+            return self.__ce2c(element).value
+        return value
+
+    def __iter_lines(
+        self,
+        rc: str,
+        min_row: int,
+        max_row: int,
+        min_col: int,
+        max_col: int,
+        values_only: bool,
+    ) -> Generator[Tuple, None, None]:
+        """
+        The abstracted generator for `iter_rows` and `iter_cols`.
+
+        :param rc: `str` indicating whether to yield each `"row"` or each `"column"`.
+        """
+        if rc == 'row':
+            lines, min_cr, max_cr, position = (
+                range(min_row, max_row + 1),
+                min_col,
+                max_col,
+                'Col',
+            )
+        else:
+            lines, min_cr, max_cr, position = (
+                range(min_col, max_col + 1),
+                min_row,
+                max_row,
+                'Row',
+            )
+
+        for idx in lines:
+            line = [None] * (max_cr - min_cr + 1)
+            for element in self.__get_line_elements(rc, idx, min_cr, max_cr):
+                line[int(element.get(position)) - min_cr] = (
+                    self.__line_value(element) if values_only else self.__ce2c(element)
+                )
+
+            if not values_only:
+                for i, c in enumerate(line):
+                    if c is None:
+                        line[i] = self.__get_cell_or_virtual(
+                            *((idx, min_cr + i) if rc == 'row' else (min_cr + i, idx))
+                        )
+            yield tuple(line)
+
+    def __iter_rc(
+        self,
+        rc: str,
+        min_row: Optional[int],
+        max_row: Optional[int],
+        min_col: Optional[int],
+        max_col: Optional[int],
+        values_only: bool,
+    ) -> Generator[Tuple, None, None]:
+        """
+        Fills in the default bounds and checks them for `iter_rows` and `iter_cols`, then returns the generator.
+        """
+        min_row = 0 if min_row is None else min_row
+        min_col = 0 if min_col is None else min_col
+        max_row = self.max_row if max_row is None else max_row
+        max_col = self.max_column if max_col is None else max_col
+
+        if max_row < min_row or max_col < min_col:
+            return (line for line in ())
+
+        self.__check_cell_bounds(min_row, min_col)
+        self.__check_cell_bounds(max_row, max_col)
+        return self.__iter_lines(rc, min_row, max_row, min_col, max_col, values_only)
+
+    def iter_rows(
+        self,
+        min_row: Optional[int] = None,
+        max_row: Optional[int] = None,
+        min_col: Optional[int] = None,
+        max_col: Optional[int] = None,
+        *,
+        values_only: bool = False,
+    ) -> Generator[Tuple, None, None]:
+        """
+        Yields the rows from `min_row` to `max_row` (inclusive), each as a tuple of the cells from `min_col` to
+        `max_col` (inclusive).  The minimums default to 0 and the maximums default to `max_row` and `max_column`, so by
+        default every row and column holding content is included.
+
+        Cells that don't exist are returned as virtual empty cells (see `Cell.is_virtual`).  If `values_only` is True,
+        then the cells' values are yielded instead, with `None` for empty cells.  Values are read straight from the
+        worksheet without creating `Cell` objects, except for expressions (whose value is an `Expression`).
+
+        Raises `IndexError` if the bounds are outside of the worksheet.
+        """
+        return self.__iter_rc('row', min_row, max_row, min_col, max_col, values_only)
+
+    def iter_cols(
+        self,
+        min_col: Optional[int] = None,
+        max_col: Optional[int] = None,
+        min_row: Optional[int] = None,
+        max_row: Optional[int] = None,
+        *,
+        values_only: bool = False,
+    ) -> Generator[Tuple, None, None]:
+        """
+        Yields the columns from `min_col` to `max_col` (inclusive), each as a tuple of the cells from `min_row` to
+        `max_row` (inclusive).  Bounds and `values_only` work as in `iter_rows`.
+        """
+        return self.__iter_rc('column', min_row, max_row, min_col, max_col, values_only)
+
+    @staticmethod
+    def __append_position(positions: Tuple[List[int], List[int]], position) -> None:
+        positions[0].append(position[0])
+        positions[1].append(position[1])
+
+    def to_numpy(
+        self,
+        cell_range: Optional[Union[str, RowColReference, Tuple[slice, slice]]] = None,
+        dtype=float,
+    ) -> Tuple[object, CellTypeMasks]:
+        """
+        Returns the numbers in `cell_range` as a dense NumPy array of `dtype`, along with `CellTypeMasks` saying which
+        cells are empty, strings, errors, or formulas.  `cell_range` is an 'A1:D10'-style range or a (row slice,
+        column slice) tuple, as when indexing the worksheet; by default, it's every row and column holding content.
+
+        Booleans are stored as 0 and 1.  Cells without a number (empty cells, strings, and errors) are NaN for floating
+        point `dtype`s and 0 otherwise.  Formulas are computed and their results stored like any other value.
+
+        Requires NumPy, which is imported when this method is called.
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError('Sheet.to_numpy requires NumPy to be installed') from e
+
+        if cell_range is None:
+            min_row, min_col, max_row, max_col = 0, 0, self.max_row, self.max_column
+        else:
+            min_row, min_col, max_row, max_col = self.__range_bounds(cell_range)
+        shape = (max(max_row - min_row + 1, 0), max(max_col - min_col + 1, 0))
+
+        values = np.zeros(shape, dtype=dtype)
+        if values.dtype.kind in 'fc':
+            values.fill(np.nan)
+        masks = CellTypeMasks(
+            empty=np.ones(shape, dtype=bool),
+            string=np.zeros(shape, dtype=bool),
+            error=np.zeros(shape, dtype=bool),
+            formula=np.zeros(shape, dtype=bool),
+        )
+        if 0 in shape:
+            return values, masks
+
+        number_positions, numbers = ([], []), []
+        kind_positions = {kind: ([], []) for kind in ('string', 'error', 'formula')}
+        for element in self.__get_cell_index().range(
+            min_row, min_col, max_row, max_col, include_empty=False
+        ):
+            position = (
+                int(element.get('Row')) - min_row,
+                int(element.get('Col')) - min_col,
+            )
+            value_type, value = cell.decode_cell_element(element)
+            if value_type == cell.VALUE_TYPE_EXPR:
+                self.__append_position(kind_positions['formula'], position)
+                value = self.__ce2c(element).get_value(compute_expression=True)
+
+            if isinstance(value, (bool, int, float)):
+                self.__append_position(number_positions, position)
+                numbers.append(value)
+            elif value_type == cell.VALUE_TYPE_ERROR or isinstance(
+                value, EvaluationError
+            ):
+                self.__append_position(kind_positions['error'], position)
+            elif value is not None:
+                self.__append_position(kind_positions['string'], position)
+
+        values[number_positions] = numbers
+        for kind, positions in kind_positions.items():
+            getattr(masks, kind)[positions] = True
+        masks.empty[:] = ~(masks.string | masks.error | masks.formula)
+        masks.empty[number_positions] = False
+        return values, masks
+
+    def fill(
+        self,
+        source: Union[str, RowColReference, Cell],
+        target_range: Union[str, RowColReference, Tuple[slice, slice]],
+    ) -> None:
+        """
+        Fill every cell in `target_range` with the content of the `source` cell, like filling down or right in
+        Gnumeric.  `source` is an 'A1'-style coordinate, a (row, col) tuple, or a Cell; `target_range` is given as in
+        `delete_range`.
+
+        If the source holds an expression, then every target cell shares it through the source's expression id, so
+        relative references are adjusted for each cell.  If the expression isn't shared yet, then it's given a new id.
+        The expression is stored in the first cell sharing it in row-major order, so filling up or left moves it from
+        the source into the top left cell of `target_range`.  Target cells are written in one pass, without looking up
+        the expression for each of them.
+
+        Otherwise, the source's value is copied into the target cells as it's stored: its value type, format, and text.
+        """
+        source_row, source_col = self.__to_coordinate(source)
+        self.__check_cell_bounds(source_row, source_col)
+        min_row, min_col, max_row, max_col = self.__range_bounds(target_range)
+
+        source_element = self.__get_cell_element(source_row, source_col)
+        cell_index = self.__get_cell_index()
+        if (
+            source_element is None
+            or cell.decode_cell_element(source_element)[0] != cell.VALUE_TYPE_EXPR
+        ):
+            if source_element is None:
+                attributes, text = {'ValueType': str(cell.VALUE_TYPE_EMPTY)}, None
+            else:
+                attributes = {
+                    key: source_element.get(key)
+                    for key in ('ValueType', 'ValueFormat')
+                    if source_element.get(key) is not None
+                }
+                text = source_element.text
+
+            replaced = [
+                e
+                for e in cell_index.range(min_row, min_col, max_row, max_col)
+                if e.get('ExprID') is not None
+            ]
+            self.__rehome_expressions(replaced, min_row, min_col, max_row, max_col)
+            self.__fill_cells(
+                min_row,
+                min_col,
+                max_row,
+                max_col,
+                attributes,
+                text,
+                create=attributes['ValueType'] != str(cell.VALUE_TYPE_EMPTY),
+            )
+            return
+
+        expr_id = source_element.get('ExprID')
+        if expr_id is None:
+            expr_id = str(
+                max((int(i) for i in self.get_expression_map()), default=0) + 1
+            )
+            source_element.set('ExprID', expr_id)
+            self.__invalidate_cached_cell(source_element)
+
+        replaced = [
+            e
+            for e in cell_index.range(min_row, min_col, max_row, max_col)
+            if e.get('ExprID') != expr_id
+        ]
+        self.__rehome_expressions(replaced, min_row, min_col, max_row, max_col)
+        self.__fill_cells(min_row, min_col, max_row, max_col, {'ExprID': expr_id}, None)
+
+        # The expression is stored in the first cell using it (in row-major order), which is where Gnumeric looks for
+        # it; filling up or left puts cells before the source
+        if source_element.text is not None:
+            origin = source_element
+        else:
+            origin_coordinate = self.get_expression_map().get(expr_id)
+            origin = (
+                None
+                if origin_coordinate is None
+                else cell_index.get(*origin_coordinate[0])
+            )
+        if origin is not None and (min_row, min_col) < (
+            int(origin.get('Row')),
+            int(origin.get('Col')),
+        ):
+            first = cell_index.get(min_row, min_col)
+            first.text = translate_references(
+                origin.text,
+                min_row - int(origin.get('Row')),
+                min_col - int(origin.get('Col')),
+            )
+            origin.text = None
+            self.__invalidate_cached_cell(first)
+            self.__invalidate_cached_cell(origin)
+
+    def __fill_cells(
+        self,
+        min_row: int,
+        min_col: int,
+        max_row: int,
+        max_col: int,
+        attributes: Dict[str, str],
+        text: Optional[str],
+        *,
+        create: bool = True,
+    ) -> None:
+        """
+        Give every cell in the (inclusive) rectangle exactly the `attributes` (besides its position) and `text`, as
+        `fill` does.  Cells that already share the expression in `attributes` are left alone, and missing cells are
+        only created if `create` is True.
+        """
+        cell_index = self.__get_cell_index()
+        cells_element = cell_index.cells_element
+        cell_tag = '{%s}Cell' % self.__workbook._ns['gnm']
+        expr_id = attributes.get('ExprID')
+        self.__trust_dimensions = False
+        for row, col in product(
+            range(min_row, max_row + 1), range(min_col, max_col + 1)
+        ):
+            element = cell_index.get(row, col)
+            if element is None:
+                if create:
+                    element = etree.SubElement(
+                        cells_element,
+                        cell_tag,
+                        Row=str(row),
+                        Col=str(col),
+                        **attributes,
+                    )
+                    element.text = text
+                    self.__register_cell_element(element)
+            elif expr_id is None or element.get('ExprID') != expr_id:
+                for key in element.keys():
+                    if key not in ('Row', 'Col'):
+                        del element.attrib[key]
+                for key, value in attributes.items():
+                    element.set(key, value)
+                element.text = text
+                cell_index.update(element)
+                self.__invalidate_cached_cell(element)
+
+    def __invalidate_cached_cell(self, element) -> None:
+        """
+        Make the `Cell` for `element`, if one is in use, forget its value and result.
+        """
+        cell_obj = self.__cell_cache.get(element)
+        if cell_obj is not None:
+            cell_obj._invalidate_result()
+
     def get_expression_map(self) -> Dict[str, Tuple[RowColReference, str]]:
         """
         In each worksheet, Gnumeric stores an expression/formula once (in the cell it's first used), then references it
@@ -594,6 +1399,29 @@ class Sheet:
         else:
             return cells
 
+    def cells_of_type(
+        self, *value_types: int, sort: Union[bool, str] = False
+    ) -> List[Cell]:
+        """
+        Returns a list of all cells whose value type is one of `value_types` (the `VALUE_TYPE_*` constants in
+        `gnumeric.cell`), e.g. `cells_of_type(VALUE_TYPE_EXPR)` for every expression in the worksheet.  The cells are
+        looked up in an index kept by value type, so only the matching cells are visited.
+
+        Use `sort` to specify whether the cells should be sorted.  If `False` (default), then no sorting will take
+        place.  If `sort` is `"row"`, then sorting will occur by row first, then by column within each row.  If `sort`
+        is `"column"`, then the opposite will happen: first sort by column, then by row within each column.
+        """
+        cell_index = self.__get_cell_index()
+        cells = [
+            self.__ce2c(element)
+            for value_type in dict.fromkeys(value_types)
+            for element in cell_index.elements_of_type(value_type)
+        ]
+        if sort:
+            return self.__sort_cells(cells, sort == 'row')
+        else:
+            return cells
+
     def delete_cell(self, row: int, col: int) -> None:
         """
         Deletes the cell at the specified row and column.  If the cell doesn't exist, then nothing will happen.  If the
@@ -608,8 +1436,520 @@ class Sheet:
                 "Can't delete originating cell for an expression"
             )
 
-        all_cells = self.__get_cells()
-        all_cells.remove(cell)
+        self.__remove_elements([cell])
+
+    def __rehome_expressions(
+        self, elements: List, min_row: int, min_col: int, max_row: int, max_col: int
+    ) -> None:
+        """
+        For each shared expression whose originating cell is among `elements` (which are about to be removed), move the
+        expression's text into the first cell (in row-major order) outside of the range that still uses it, rewriting
+        its references from that cell's perspective.
+        """
+        origins = {
+            e.get('ExprID'): e
+            for e in elements
+            if e.get('ExprID') is not None and e.text is not None
+        }
+        if not origins:
+            return
+
+        new_origins = {}
+        for element in self.__get_expression_id_cells():
+            expr_id = element.get('ExprID')
+            row, col = int(element.get('Row')), int(element.get('Col'))
+            if expr_id not in origins or (
+                min_row <= row <= max_row and min_col <= col <= max_col
+            ):
+                continue
+            elif expr_id not in new_origins or (row, col) < new_origins[expr_id][0]:
+                new_origins[expr_id] = ((row, col), element)
+
+        for expr_id, ((row, col), element) in new_origins.items():
+            origin = origins[expr_id]
+            element.text = translate_references(
+                origin.text,
+                row - int(origin.get('Row')),
+                col - int(origin.get('Col')),
+            )
+            cell_obj = self.__cell_cache.get(element)
+            if cell_obj is not None:
+                cell_obj._invalidate_value()
+
+    def __remove_cells(
+        self, min_row: int, min_col: int, max_row: int, max_col: int
+    ) -> None:
+        """
+        Removes every cell element in the (inclusive) rectangle, in one pass over the cell index.  `Cell` objects still
+        in use for the removed elements become virtual empty cells.
+        """
+        elements = list(
+            self.__get_cell_index().range(min_row, min_col, max_row, max_col)
+        )
+        self.__rehome_expressions(elements, min_row, min_col, max_row, max_col)
+        self.__remove_elements(elements)
+
+    def __remove_elements(self, elements: Iterable) -> None:
+        """
+        Removes the cell elements from the worksheet and its index.  `Cell` objects still in use for them become virtual
+        empty cells, so each position keeps a single `Cell`.
+        """
+        cell_index = self.__get_cell_index()
+        cells_element = cell_index.cells_element
+        with self.__cell_cache_lock:
+            for element in elements:
+                cells_element.remove(element)
+                cell_index.remove(element)
+                cell_obj = self.__cell_cache.pop(element, None)
+                if cell_obj is not None:
+                    cell_obj._unbind()
+                    self.__virtual_cells[cell_obj.row, cell_obj.column] = cell_obj
+        self.__trust_dimensions = False
+
+    def __reset_styles(
+        self, min_row: int, min_col: int, max_row: int, max_col: int
+    ) -> None:
+        """
+        Give the (inclusive) rectangle the default style.  Style regions overlapping it are cut down to the parts
+        outside of the rectangle, and a new region with the default style covers the rectangle.
+        """
+        styles = self.__get_styles()
+        for region in list(
+            styles.iterchildren('{%s}StyleRegion' % self.__workbook._ns['gnm'])
+        ):
+            start_row, end_row = int(region.get('startRow')), int(region.get('endRow'))
+            start_col, end_col = int(region.get('startCol')), int(region.get('endCol'))
+            if (
+                end_row < min_row
+                or start_row > max_row
+                or end_col < min_col
+                or start_col > max_col
+            ):
+                continue
+
+            middle_rows = (max(start_row, min_row), min(end_row, max_row))
+            pieces = [
+                ((start_row, min_row - 1), (start_col, end_col)),
+                ((max_row + 1, end_row), (start_col, end_col)),
+                (middle_rows, (start_col, min_col - 1)),
+                (middle_rows, (max_col + 1, end_col)),
+            ]
+            for (piece_start_row, piece_end_row), (
+                piece_start_col,
+                piece_end_col,
+            ) in pieces:
+                if piece_start_row > piece_end_row or piece_start_col > piece_end_col:
+                    continue
+                piece = deepcopy(region)
+                piece.set('startRow', str(piece_start_row))
+                piece.set('endRow', str(piece_end_row))
+                piece.set('startCol', str(piece_start_col))
+                piece.set('endCol', str(piece_end_col))
+                region.addprevious(piece)
+            styles.remove(region)
+
+        styles.append(
+            etree.fromstring(
+                NEW_STYLE_REGION
+                % {
+                    b'start_row': min_row,
+                    b'start_col': min_col,
+                    b'end_row': max_row,
+                    b'end_col': max_col,
+                }
+            ).getchildren()[0]
+        )
+        self._styles_changed()
+
+    def _styles_changed(self) -> None:
+        """
+        Forget the style regions found so far, so they're looked up again.  Should not be called directly -- it's called
+        automatically when the sheet's style regions change.
+        """
+        self.__style_index = None
+        with self.__cell_cache_lock:
+            for cell_obj in list(self.__cell_cache.values()) + list(
+                self.__virtual_cells.values()
+            ):
+                cell_obj._invalidate_style()
+
+    def delete_range(
+        self, cell_range: Union[str, RowColReference, Tuple[slice, slice]]
+    ) -> None:
+        """
+        Deletes every cell in `cell_range`, an 'A1:D10'-style range or a (row slice, column slice) tuple as when
+        indexing the worksheet (a single coordinate is a range of one cell).  `Cell` objects for deleted cells become
+        virtual empty cells.
+
+        Unlike `delete_cell`, originating cells of shared expressions can be deleted: the expression moves to the first
+        cell outside of the range that still uses it.
+        """
+        self.__remove_cells(*self.__range_bounds(cell_range))
+
+    def clear_range(
+        self,
+        cell_range: Union[str, RowColReference, Tuple[slice, slice]],
+        *,
+        keep_styles: bool = True,
+    ) -> None:
+        """
+        Clears the contents of every cell in `cell_range`, as `delete_range` does.  If `keep_styles` is False, then
+        the cells' formatting is reset to the default style too.
+        """
+        bounds = self.__range_bounds(cell_range)
+        self.__remove_cells(*bounds)
+        if not keep_styles:
+            self.__reset_styles(*bounds)
+
+    @staticmethod
+    def __shift_position(position: int, idx: int, amount: int) -> Optional[int]:
+        """
+        Where the row (or column) `position` ends up after `amount` rows are inserted at `idx`, or `-amount` rows are
+        deleted starting at `idx`.  Returns `None` if the row is deleted.
+        """
+        if position < idx:
+            return position
+        elif amount < 0 and position < idx - amount:
+            return None
+        return position + amount
+
+    @staticmethod
+    def __shift_span(
+        start: int, end: int, idx: int, amount: int, max_allowed: int, tile: bool
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Where the span of rows (or columns) from `start` to `end` ends up after `amount` rows are inserted at `idx`,
+        or `-amount` rows are deleted starting at `idx`.  Returns `None` if nothing of the span is left.
+
+        If `tile` is True, then the span is one of a set that covers the whole sheet (like style regions), so spans are
+        stretched to keep the sheet covered: the span before an insertion grows over the inserted rows, and the spans
+        at the end of the sheet grow over the rows freed up by a deletion.
+        """
+        if amount > 0:
+            if start < idx <= end + (1 if tile else 0) or (tile and start == idx == 0):
+                end += amount
+            elif start >= idx:
+                start, end = start + amount, end + amount
+
+            if start > max_allowed:
+                return None
+            return start, min(end, max_allowed)
+        else:
+            count = -amount
+            new_start = start if start < idx else max(start - count, idx)
+            if tile and end == max_allowed:
+                new_end = max_allowed
+            elif end < idx:
+                new_end = end
+            else:
+                new_end = end - count if end >= idx + count else idx - 1
+            return (new_start, new_end) if new_start <= new_end else None
+
+    def _unshare_expressions(
+        self, fn, range_fn, move: Callable[[int, int], RowColReference]
+    ) -> None:
+        """
+        Gives each cell using a shared expression its own copy of the expression (with its references translated to
+        the cell), if the expression's references can't be rewritten with `fn` and `range_fn` once for all of those
+        cells.  That is the case when the cells move apart (`move` gives where each cell ends up), or when their
+        references fall on different sides of the rows or columns being inserted or deleted.  Should not be called
+        directly -- it's used when rows or columns are inserted or deleted.
+        """
+        shared = {}
+        for element in self.__get_expression_id_cells():
+            shared.setdefault(element.get('ExprID'), []).append(element)
+
+        for elements in shared.values():
+            origin = next((e for e in elements if e.text is not None), None)
+            if origin is None:
+                continue
+
+            origin_row, origin_col = int(origin.get('Row')), int(origin.get('Col'))
+            new_origin_row, new_origin_col = move(origin_row, origin_col)
+            mapped_text = map_references(origin.text, fn, range_fn)
+
+            def stays_shared(element, text) -> bool:
+                new_row, new_col = move(
+                    int(element.get('Row')), int(element.get('Col'))
+                )
+                return map_references(text, fn, range_fn) == translate_references(
+                    mapped_text, new_row - new_origin_row, new_col - new_origin_col
+                )
+
+            texts = {
+                element: translate_references(
+                    origin.text,
+                    int(element.get('Row')) - origin_row,
+                    int(element.get('Col')) - origin_col,
+                )
+                for element in elements
+            }
+            if all(stays_shared(element, text) for element, text in texts.items()):
+                continue
+
+            for element, text in texts.items():
+                element.text = text
+                del element.attrib['ExprID']
+                self.__invalidate_cached_cell(element)
+
+    def _map_expression_references(self, fn, range_fn) -> None:
+        """
+        Rewrite the cell references in every expression stored in this sheet, as `map_references` does with `fn` and
+        `range_fn`.  Should not be called directly -- it's used when rows or columns are inserted or deleted.
+        """
+        for element in self.__get_cell_index().elements_of_type(cell.VALUE_TYPE_EXPR):
+            if element.text is None:
+                continue
+            text = map_references(element.text, fn, range_fn)
+            if text != element.text:
+                element.text = text
+                self.__invalidate_cached_cell(element)
+
+    def __shift_rc(self, rc: str, idx: int, amount: int) -> None:
+        """
+        The abstracted method for `insert_rows`, `delete_rows`, `insert_cols`, and `delete_cols`.  If `amount` is
+        positive, then that many rows (or columns) are inserted at `idx`; if negative, then `-amount` are deleted
+        starting at `idx`.
+
+        :param rc: `str` indicating whether this is for `"column"` or `"row"`.
+        """
+        if self.type == SHEET_TYPE_OBJECT:
+            raise UnsupportedOperationException('Chartsheet does not have ' + rc + 's')
+        elif not self.__is_valid_rc(rc, idx):
+            raise IndexError(
+                f'{rc.title()} ({idx}) is out of allowed bounds of [0, {self.__max_allowed_rc(rc)}]'
+            )
+
+        ns = self.__workbook._ns
+        max_allowed = self.__max_allowed_rc(rc)
+        if rc == 'row':
+            attribute, start_attribute, end_attribute = 'Row', 'startRow', 'endRow'
+        else:
+            attribute, start_attribute, end_attribute = 'Col', 'startCol', 'endCol'
+
+        def to_bounds(start: int, end: int) -> Tuple[int, int, int, int]:
+            # The bounds of the rows (or columns) from `start` to `end`, across the whole sheet
+            if rc == 'row':
+                return start, 0, end, self.max_allowed_column
+            return 0, start, self.max_allowed_row, end
+
+        def to_coordinate(shifted: int, other: int) -> RowColReference:
+            # The coordinate of a cell in row (or column) `shifted` and column (or row) `other`
+            return RowColReference(
+                *((shifted, other) if rc == 'row' else (other, shifted))
+            )
+
+        if amount > 0:
+            last = getattr(self.__get_cell_index(), 'max_' + rc)
+            if last > max_allowed - amount and last >= idx:
+                raise IndexError(
+                    f'Inserting {amount} {rc}s at {idx} would push cells off the sheet'
+                )
+            # Only empty cells can be pushed off the sheet
+            if max_allowed - amount + 1 >= idx:
+                self.__remove_cells(*to_bounds(max_allowed - amount + 1, max_allowed))
+        else:
+            amount = -min(-amount, max_allowed - idx + 1)
+            self.__remove_cells(*to_bounds(idx, idx - amount - 1))
+
+        title = self.title
+
+        def shift_reference(sheet_name, row, col, row_fixed, col_fixed):
+            if sheet_name != title:
+                return row, col
+            shifted, other = (row, col) if rc == 'row' else (col, row)
+            shifted = self.__shift_position(shifted, idx, amount)
+            if shifted is None or shifted > max_allowed:
+                return None
+            return to_coordinate(shifted, other)
+
+        def shift_range(sheet_name, start_row, start_col, end_row, end_col):
+            if sheet_name != title:
+                return start_row, start_col, end_row, end_col
+            starts, ends = (start_row, end_row) if rc == 'row' else (start_col, end_col)
+            span = self.__shift_span(
+                min(starts, ends),
+                max(starts, ends),
+                idx,
+                amount,
+                max_allowed,
+                tile=False,
+            )
+            if span is None:
+                return None
+            elif rc == 'row':
+                return span[0], start_col, span[1], end_col
+            return start_row, span[0], end_row, span[1]
+
+        def shift_cell(row, col):
+            shifted, other = (row, col) if rc == 'row' else (col, row)
+            return to_coordinate(self.__shift_position(shifted, idx, amount), other)
+
+        def keep_cell(row, col):
+            return row, col
+
+        reference_fns = [
+            (
+                worksheet,
+                lambda sheet_name, *reference, ws=worksheet: shift_reference(
+                    ws.title if sheet_name is None else sheet_name, *reference
+                ),
+                lambda sheet_name, *bounds, ws=worksheet: shift_range(
+                    ws.title if sheet_name is None else sheet_name, *bounds
+                ),
+            )
+            for worksheet in self.__workbook.worksheets
+        ]
+
+        # Shared expressions that wouldn't be rewritten the same way for every cell using them are split up first
+        for worksheet, fn, range_fn in reference_fns:
+            worksheet._unshare_expressions(
+                fn, range_fn, shift_cell if worksheet == self else keep_cell
+            )
+
+        # Move the cells after `idx`; the index is rebuilt from the moved elements when it's next needed
+        for element in self.__get_cell_index().range(
+            *to_bounds(idx, max_allowed), include_empty=True
+        ):
+            element.set(attribute, str(int(element.get(attribute)) + amount))
+        self.__cell_index = None
+        self.__trust_dimensions = False
+
+        with self.__cell_cache_lock:
+            virtual_cells = list(self.__virtual_cells.values())
+            self.__virtual_cells.clear()
+            for cell_obj in virtual_cells:
+                shifted, other = (
+                    (cell_obj.row, cell_obj.column)
+                    if rc == 'row'
+                    else (cell_obj.column, cell_obj.row)
+                )
+                shifted = self.__shift_position(shifted, idx, amount)
+                if shifted is not None and shifted <= max_allowed:
+                    coordinate = to_coordinate(shifted, other)
+                    cell_obj._relocate(coordinate)
+                    self.__virtual_cells[coordinate] = cell_obj
+
+        # Style regions
+        styles = self.__get_styles()
+        for region in list(styles.iterchildren('{%s}StyleRegion' % ns['gnm'])):
+            span = self.__shift_span(
+                int(region.get(start_attribute)),
+                int(region.get(end_attribute)),
+                idx,
+                amount,
+                max_allowed,
+                tile=True,
+            )
+            if span is None:
+                styles.remove(region)
+            else:
+                region.set(start_attribute, str(span[0]))
+                region.set(end_attribute, str(span[1]))
+        self._styles_changed()
+
+        # Row heights (or column widths)
+        info_tag = '{%s}%s' % (ns['gnm'], 'RowInfo' if rc == 'row' else 'ColInfo')
+        for info in list(self.__sheet.iter(info_tag)):
+            start = int(info.get('No'))
+            span = self.__shift_span(
+                start,
+                start + int(info.get('Count', '1')) - 1,
+                idx,
+                amount,
+                max_allowed,
+                tile=False,
+            )
+            if span is None:
+                info.getparent().remove(info)
+                continue
+
+            info.set('No', str(span[0]))
+            if span[1] > span[0]:
+                info.set('Count', str(span[1] - span[0] + 1))
+            else:
+                info.attrib.pop('Count', None)
+
+        # Merged cells
+        for merge in list(self.__sheet.iter('{%s}Merge' % ns['gnm'])):
+            start, end = range_from_spreadsheet(merge.text)
+            span = self.__shift_span(
+                getattr(start, rc[:3]),
+                getattr(end, rc[:3]),
+                idx,
+                amount,
+                max_allowed,
+                tile=False,
+            )
+            if span is None:
+                merge.getparent().remove(merge)
+                continue
+
+            other = 'col' if rc == 'row' else 'row'
+            merge.text = '%s:%s' % (
+                coordinate_to_spreadsheet(
+                    to_coordinate(span[0], getattr(start, other))
+                ),
+                coordinate_to_spreadsheet(to_coordinate(span[1], getattr(end, other))),
+            )
+
+        # References to this sheet in expressions, in this sheet and the rest of the workbook
+        for worksheet, fn, range_fn in reference_fns:
+            worksheet._map_expression_references(fn, range_fn)
+
+    def insert_rows(self, row: int, amount: int = 1) -> None:
+        """
+        Insert `amount` empty rows before `row`, moving the rows from `row` onwards down.  Style regions, row heights,
+        merged cells, and references to the moved cells (in this sheet or others) move along with them.
+
+        Raises `ValueError` if `amount` is less than 1 and `IndexError` if `row` is outside of the worksheet or if
+        cells holding content would be pushed off the end of the worksheet.
+        """
+        if amount < 1:
+            raise ValueError(f'The number of rows to insert must be positive: {amount}')
+        self.__shift_rc('row', row, amount)
+
+    def delete_rows(self, row: int, amount: int = 1) -> None:
+        """
+        Delete `amount` rows starting at `row`, moving the rows after them up.  Cells in the deleted rows are removed as
+        in `delete_range`, and references to them become `#REF!`.  Everything else moves as in `insert_rows`.
+
+        Raises `ValueError` if `amount` is less than 1 and `IndexError` if `row` is outside of the worksheet.
+        """
+        if amount < 1:
+            raise ValueError(f'The number of rows to delete must be positive: {amount}')
+        self.__shift_rc('row', row, -amount)
+
+    def insert_cols(self, column: int, amount: int = 1) -> None:
+        """
+        Insert `amount` empty columns before `column`, moving the columns from `column` onwards to the right.  See
+        `insert_rows` for what moves along and when errors are raised.
+        """
+        if amount < 1:
+            raise ValueError(
+                f'The number of columns to insert must be positive: {amount}'
+            )
+        self.__shift_rc('column', column, amount)
+
+    def delete_cols(self, column: int, amount: int = 1) -> None:
+        """
+        Delete `amount` columns starting at `column`, moving the columns after them to the left.  See `delete_rows`
+        for what happens to the deleted cells and when errors are raised.
+        """
+        if amount < 1:
+            raise ValueError(
+                f'The number of columns to delete must be positive: {amount}'
+            )
+        self.__shift_rc('column', column, -amount)
+
+    def _update_cell(self, cell_element) -> None:
+        """
+        Brings the sheet's bookkeeping up to date after `cell_element`'s content changed.  Should not be called
+        directly -- cells call this automatically when their value is set.
+        """
+        self.__trust_dimensions = False
+        if self.__cell_index is not None:
+            self.__cell_index.update(cell_element)
 
     def _clean_data(self) -> None:
         """
@@ -618,10 +1958,7 @@ class Sheet:
         """
 
         # Delete empty cells
-        all_cells = self.__get_cells()
-        empty_cells = self.__get_empty_cells()
-        for empty_cell in empty_cells:
-            all_cells.remove(empty_cell)
+        self.__remove_elements(self.__get_cell_index().empty_elements())
 
         # Update max col and row
         self.__sheet.find('gnm:MaxCol', self.__workbook._ns).text = str(self.max_column)
@@ -0,0 +1,102 @@
+"""
+Gnumeric-py: Reading and writing gnumeric files with python
+Copyright (C) 2017 Michael Lipschultz
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+
+class StyleIndex:
+    """
+    A two-dimensional interval index over the `gnm:StyleRegion` elements of a worksheet.
+
+    The sheet's rows are split into bands at every row where a style region starts or ends, and a segment tree is
+    built over the bands.  Each region is stored in the few tree nodes whose bands together make up its rows, so the
+    index holds O(n log n) entries for n regions, however the regions are staggered.  The regions stored in a node all
+    cover every row of the node's bands, so (as style regions don't overlap) they're sorted by their first column.
+    Finding the region for a cell walks from the cell's band up to the root, with a binary search for the column in
+    each node on the way.
+
+    This relies on Gnumeric's guarantee that style regions do not overlap.
+    """
+
+    def __init__(self, styles_element, ns):
+        regions = [
+            (
+                int(region.get('startRow')),
+                int(region.get('endRow')),
+                int(region.get('startCol')),
+                int(region.get('endCol')),
+                region,
+            )
+            for region in styles_element.iterchildren('{%s}StyleRegion' % ns['gnm'])
+        ]
+
+        boundaries = sorted({r[0] for r in regions} | {r[1] + 1 for r in regions})
+        self.__band_starts: List[int] = boundaries
+        self.__leaves = 1
+        while self.__leaves < len(boundaries):
+            self.__leaves *= 2
+
+        band_of = {row: band for band, row in enumerate(boundaries)}
+        nodes: Dict[int, List[Tuple[int, int, object]]] = {}
+        for start_row, end_row, start_col, end_col, region in regions:
+            # The nodes covering bands [lo, hi) of the tree
+            lo = band_of[start_row] + self.__leaves
+            hi = band_of[end_row + 1] + self.__leaves
+            while lo < hi:
+                if lo & 1:
+                    nodes.setdefault(lo, []).append((start_col, end_col, region))
+                    lo += 1
+                if hi & 1:
+                    hi -= 1
+                    nodes.setdefault(hi, []).append((start_col, end_col, region))
+                lo //= 2
+                hi //= 2
+
+        self.__nodes: Dict[int, Tuple[List[int], List[Tuple[int, object]]]] = {
+            node: self.__build_node(entries) for node, entries in nodes.items()
+        }
+
+    @staticmethod
+    def __build_node(entries) -> Tuple[List[int], List[Tuple[int, object]]]:
+        """
+        Sort the regions in a node by their first column.
+        """
+        entries.sort(key=lambda e: e[0])
+        return [e[0] for e in entries], [(e[1], e[2]) for e in entries]
+
+    def find(self, row: int, col: int) -> Optional[object]:
+        """
+        Returns the `gnm:StyleRegion` element that covers (`row`, `col`), or `None` if no region covers it.
+        """
+        band_idx = bisect_right(self.__band_starts, row) - 1
+        if band_idx < 0 or band_idx >= len(self.__band_starts) - 1:
+            return None
+
+        node = band_idx + self.__leaves
+        while node:
+            entries = self.__nodes.get(node)
+            if entries is not None:
+                start_cols, regions = entries
+                region_idx = bisect_right(start_cols, col) - 1
+                if region_idx >= 0:
+                    end_col, region = regions[region_idx]
+                    if col <= end_col:
+                        return region
+            node //= 2
+        return None
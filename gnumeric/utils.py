@@ -16,7 +16,7 @@ You should have received a copy of the GNU General Public License
 along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
-from typing import NamedTuple, Optional, Union
+from typing import NamedTuple, Optional, Tuple, Union
 
 
 class RowColReference(NamedTuple):
@@ -129,3 +129,19 @@ def coordinate_from_spreadsheet(coord: str) -> RowColReference:
         row_from_spreadsheet(coord[first_row_position:]),
         column_from_spreadsheet(coord[:first_row_position]),
     )
+
+
+def range_from_spreadsheet(cell_range: str) -> Tuple[RowColReference, RowColReference]:
+    """
+    Convert a range from spreadsheet notation into its top-left and bottom-right (row, column) tuples.  The corners
+    can be given in any order, and a single coordinate is a range of one cell.
+
+    Example `'D$10:A1'` -> `((0, 0), (9, 3))`
+    """
+    first, _, second = cell_range.partition(':')
+    first = coordinate_from_spreadsheet(first)
+    second = coordinate_from_spreadsheet(second) if second else first
+    return (
+        RowColReference(min(first.row, second.row), min(first.col, second.col)),
+        RowColReference(max(first.row, second.row), max(first.col, second.col)),
+    )
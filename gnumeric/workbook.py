@@ -17,8 +17,9 @@ along with this program. If not, see <http://www.gnu.org/licenses/>.
 """
 
 import gzip
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
-from typing import List, Optional, Self, Union
+from typing import Dict, List, Optional, Self, Union
 from pathlib import Path
 
 import dateutil.parser
@@ -144,13 +145,20 @@ NEW_SHEET = b"""<?xml version="1.0" encoding="UTF-8"?><gnm:ROOT xmlns:gnm="http:
 
 
 class Workbook:
-    def __init__(self, workbook_root_element=None):
+    def __init__(self, workbook_root_element=None, *, trust_dimensions: bool = False):
+        """
+        :param trust_dimensions: If `True`, then each sheet reports its max row and column from the dimensions Gnumeric
+            stored in the file, without looking at any cells, until the sheet's cells are changed.
+        """
         self._ns = ALL_NAMESPACES
+        self.__trust_dimensions = trust_dimensions
         if workbook_root_element is None:
             self.__root = etree.fromstring(EMPTY_WORKBOOK)
             self.creation_date = datetime.now()
         else:
             self.__root = workbook_root_element
+        self.__sheet_cache = {}
+        self.__sheet_indexes = None
 
     def __creation_date_element(self):
         return self.__root.find(
@@ -163,6 +171,23 @@ class Workbook:
     def __sheet_elements(self):
         return self.__root.find('gnm:Sheets', self._ns)
 
+    def __get_sheet_indexes(self) -> Dict[str, int]:
+        """
+        Returns a dict of sheet name -> sheet index, building it if the sheets have changed since it was last built.
+        """
+        if self.__sheet_indexes is None:
+            self.__sheet_indexes = {}
+            for i, name in enumerate(self.get_sheet_names()):
+                self.__sheet_indexes.setdefault(name, i)
+        return self.__sheet_indexes
+
+    def _sheets_changed(self) -> None:
+        """
+        Forget the sheet name -> index map because a sheet was added, removed, or renamed.  Should not be called
+        directly -- sheets call this automatically.
+        """
+        self.__sheet_indexes = None
+
     def __get_ui_data_element(self):
         return self.__root.find('gnm:UIData', self._ns)
 
@@ -218,7 +243,7 @@ class Workbook:
         :raises DuplicateTitleException: When a sheet with the same title already exists in the workbook
         :return: The worksheet
         """
-        if title in self.sheetnames:
+        if title in self.__get_sheet_indexes():
             raise DuplicateTitleException('A sheet titled "%s" already exists' % title)
 
         sheet_name_element = etree.fromstring(NEW_SHEET_NAME).getchildren()[0]
@@ -228,8 +253,10 @@ class Workbook:
             index = len(self) + index + 1
         self.__sheet_name_elements().insert(index, sheet_name_element)
         self.__sheet_elements().insert(index, sheet_element)
+        self._sheets_changed()
 
         ws = Sheet(sheet_name_element, sheet_element, self)
+        self.__sheet_cache[sheet_element] = ws
         ws.title = title
         return ws
 
@@ -255,7 +282,7 @@ class Workbook:
         if isinstance(sheet, int):
             self.__get_ui_data_element().set('SelectedTab', str(sheet))
         elif isinstance(sheet, str):
-            self.set_active_sheet(self.sheetnames.index(sheet))
+            self.set_active_sheet(self.__get_sheet_indexes()[sheet])
         elif isinstance(sheet, Sheet):
             self.set_active_sheet(self.get_index(sheet))
 
@@ -269,9 +296,17 @@ class Workbook:
 
         :raises IndexError: When index is out of bounds
         """
-        return Sheet(
-            self.__sheet_name_elements()[index], self.__sheet_elements()[index], self
-        )
+        sheet_element = self.__sheet_elements()[index]
+        ws = self.__sheet_cache.get(sheet_element)
+        if ws is None:
+            ws = Sheet(
+                self.__sheet_name_elements()[index],
+                sheet_element,
+                self,
+                trust_dimensions=self.__trust_dimensions,
+            )
+            self.__sheet_cache[sheet_element] = ws
+        return ws
 
     def get_sheet_by_name(self, name: str) -> Sheet:
         """
@@ -279,12 +314,10 @@ class Workbook:
 
         :raises KeyError: When no worksheet with that name exists
         """
-        names = self.sheetnames
-        try:
-            idx = names.index(name)
-            return self.get_sheet_by_index(idx)
-        except ValueError:
+        idx = self.__get_sheet_indexes().get(name)
+        if idx is None:
             raise KeyError('No sheet named "%s" exists' % name)
+        return self.get_sheet_by_index(idx)
 
     def __getitem__(self, key: Union[str, int]) -> Sheet:
         """
@@ -305,7 +338,9 @@ class Workbook:
         """
         Given a worksheet, find its index in the workbook.
         """
-        index = self.sheetnames.index(ws.title)
+        index = self.__get_sheet_indexes().get(ws.title)
+        if index is None:
+            raise ValueError('No sheet named "%s" exists' % ws.title)
         if ws != self.get_sheet_by_index(index):
             raise WrongWorkbookException(
                 'The worksheet does not belong to this workbook.'
@@ -334,7 +369,8 @@ class Workbook:
 
         Raises `WrongWorkbookException` if worksheet is not part of this workbook.
         """
-        self.get_index(ws)
+        index = self.get_index(ws)
+        self.__sheet_cache.pop(self.__sheet_elements()[index], None)
         ws.remove_from_workbook()
 
     def remove(self, ws: Union[int, str, Sheet]) -> None:
@@ -379,6 +415,17 @@ class Workbook:
         """
         return [s for s in self.sheets if s.type == sheet.SHEET_TYPE_REGULAR]
 
+    @contextmanager
+    def batch(self):
+        """
+        A context manager that groups many writes to the workbook's worksheets together: `with wb.batch(): ...`.  Every
+        worksheet is in a batch (see `Sheet.batch`) until the block ends.
+        """
+        with ExitStack() as stack:
+            for ws in self.worksheets:
+                stack.enter_context(ws.batch())
+            yield self
+
     def __str__(self) -> str:
         return 'Workbook' + str(self.sheetnames)
 
@@ -403,11 +450,16 @@ class Workbook:
                 fout.write(xml)
 
     @classmethod
-    def load_workbook(clas, filepath: Union[str, Path]) -> Self:
+    def load_workbook(
+        clas, filepath: Union[str, Path], *, trust_dimensions: bool = False
+    ) -> Self:
         """
         Open the given filepath and return the workbook.
 
         Handles both uncompressed (`.xml`) and compressed (`.gnumeric`) Gnumeric files.
+
+        If `trust_dimensions` is `True`, then each sheet's `max_row` and `max_column` come from the dimensions stored in
+        the file (so no cells need to be read to answer them) until the sheet's cells are changed.
         """
         filepath = str(filepath)
 
@@ -420,4 +472,4 @@ class Workbook:
             contents = fin.read()
 
         root = etree.fromstring(contents)
-        return Workbook(root)
+        return Workbook(root, trust_dimensions=trust_dimensions)
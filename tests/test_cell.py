@@ -62,6 +62,20 @@ class TestCell:
             == '_($* #,##0.00_);_($* (#,##0.00);_($* "-"??_);_(@_)'
         )
 
+    def test_cells_have_no_instance_dict(self, empty_worksheet):
+        test_cell = empty_worksheet.cell(0, 0)
+        assert not hasattr(test_cell, '__dict__')
+
+    def test_reading_values_does_not_look_up_style(self, monkeypatch):
+        workbook = Workbook.load_workbook(TEST_GNUMERIC_FILE_PATH)
+        worksheet = workbook.get_sheet_by_name('CellTypes')
+
+        def fail(*args):
+            raise AssertionError('style was looked up')
+
+        monkeypatch.setattr(worksheet, '_get_cell_style', fail)
+        assert [c.value for c in worksheet.get_row(0)] == ['Float', 17.0]
+
 
 class TestCellType:
     def test_cell_types(self):
@@ -310,6 +324,30 @@ class TestCellValue:
             assert test_cell.is_datetime() is True
             assert expected_datetime == test_cell.result
 
+    def test_value_is_decoded_once(self, empty_worksheet, monkeypatch):
+        calls = []
+        decode = cell.decode_cell_element
+
+        def counting_decode(element):
+            calls.append(element)
+            return decode(element)
+
+        monkeypatch.setattr(cell, 'decode_cell_element', counting_decode)
+        test_cell = empty_worksheet.cell(0, 0)
+        test_cell.value = 12
+        assert test_cell.value == 12
+        assert test_cell.value == 12
+        assert test_cell.value_type == cell.VALUE_TYPE_INTEGER
+        assert len(calls) == 1
+
+    def test_setting_value_replaces_decoded_value(self, empty_worksheet):
+        test_cell = empty_worksheet.cell(0, 0)
+        test_cell.value = 12
+        assert test_cell.value == 12
+        test_cell.value = 'text'
+        assert test_cell.value == 'text'
+        assert test_cell.value_type == cell.VALUE_TYPE_STRING
+
 
 class TestCellSharedExpression:
     def test_get_shared_expression_value_from_originating_cell(self):
@@ -0,0 +1,180 @@
+"""
+Gnumeric-py: Reading and writing gnumeric files with python
+Copyright (C) 2017 Michael Lipschultz
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from lxml import etree
+
+from gnumeric.cell_index import CellIndex
+from gnumeric.workbook import ALL_NAMESPACES
+
+CELLS = b"""<gnm:Cells xmlns:gnm="http://www.gnumeric.org/v10.dtd">
+<gnm:Cell Row="0" Col="0" ValueType="60">a</gnm:Cell>
+<gnm:Cell Row="0" Col="2" ValueType="30">3</gnm:Cell>
+<gnm:Cell Row="4" Col="1" ValueType="40">1.5</gnm:Cell>
+</gnm:Cells>"""
+
+
+def new_cell_element(row, col):
+    element = etree.Element('{%s}Cell' % ALL_NAMESPACES['gnm'])
+    element.set('Row', str(row))
+    element.set('Col', str(col))
+    element.set('ValueType', '10')
+    return element
+
+
+class TestCellIndex:
+    def test_index_contains_existing_cells(self):
+        cells = etree.fromstring(CELLS)
+        index = CellIndex(cells, ALL_NAMESPACES)
+        assert len(index) == 3
+        assert index.get(0, 2).text == '3'
+        assert index.get(4, 1).text == '1.5'
+
+    def test_missing_cell_returns_none(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        assert index.get(1, 1) is None
+
+    def test_adding_cell(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        element = new_cell_element(7, 3)
+        index.add(element)
+        assert index.get(7, 3) is element
+
+    def test_removing_cell(self):
+        cells = etree.fromstring(CELLS)
+        index = CellIndex(cells, ALL_NAMESPACES)
+        index.remove(index.get(0, 0))
+        assert index.get(0, 0) is None
+        assert len(index) == 2
+
+    def test_row_is_sorted_by_column(self):
+        cells = etree.fromstring(CELLS)
+        index = CellIndex(cells, ALL_NAMESPACES)
+        index.add(new_cell_element(0, 1))
+        assert [int(e.get('Col')) for e in index.row(0)] == [0, 1, 2]
+
+    def test_row_within_bounds(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        index.add(new_cell_element(0, 5))
+        assert [int(e.get('Col')) for e in index.row(0, 1, 4)] == [2]
+
+    def test_column_is_sorted_by_row(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        index.add(new_cell_element(2, 1))
+        index.add(new_cell_element(9, 1))
+        assert [int(e.get('Row')) for e in index.column(1, 3)] == [4, 9]
+
+    def test_removed_cell_is_not_in_row_or_column(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        index.remove(index.get(4, 1))
+        assert index.row(4) == []
+        assert index.column(1) == []
+
+    def test_bounds(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        assert (index.min_row, index.min_column, index.max_row, index.max_column) == (
+            0,
+            0,
+            4,
+            2,
+        )
+
+    def test_bounds_ignore_empty_cells(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        index.add(new_cell_element(10, 10))
+        assert index.max_row == 4
+        assert index.max_column == 2
+        assert len(index.empty_elements()) == 1
+
+    def test_bounds_follow_updated_cells(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        element = new_cell_element(10, 10)
+        index.add(element)
+        element.set('ValueType', '60')
+        element.text = 'now has content'
+        index.update(element)
+        assert index.max_row == 10
+        assert index.max_column == 10
+
+        element.set('ValueType', '10')
+        element.text = None
+        index.update(element)
+        assert index.max_row == 4
+        assert index.max_column == 2
+
+    def test_bounds_of_empty_index(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        for row, col in ((0, 0), (0, 2), (4, 1)):
+            index.remove(index.get(row, col))
+        assert (index.min_row, index.min_column, index.max_row, index.max_column) == (
+            -1,
+            -1,
+            -1,
+            -1,
+        )
+
+    def test_row_and_column_extents(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        assert index.min_column_in_row(0) == 0
+        assert index.max_column_in_row(0) == 2
+        assert index.min_row_in_column(1) == 4
+        assert index.max_row_in_column(1) == 4
+        assert index.max_column_in_row(1) == -1
+        assert index.max_row_in_column(3) == -1
+
+    def test_row_extents_ignore_empty_cells(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        index.add(new_cell_element(0, 9))
+        assert index.max_column_in_row(0) == 2
+
+    def test_row_extents_follow_removed_cells(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        index.remove(index.get(0, 2))
+        assert index.max_column_in_row(0) == 0
+        assert index.max_column == 1
+
+    def test_elements_by_value_type(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        assert [e.text for e in index.elements_of_type(60)] == ['a']
+        assert [e.text for e in index.elements_of_type(30)] == ['3']
+        assert index.elements_of_type(-10) == []
+
+    def test_value_types_follow_updated_and_removed_cells(self):
+        index = CellIndex(etree.fromstring(CELLS), ALL_NAMESPACES)
+        element = new_cell_element(10, 10)
+        index.add(element)
+        assert element in index.elements_of_type(10)
+
+        del element.attrib['ValueType']
+        element.text = '=A1'
+        index.update(element)
+        assert index.elements_of_type(10) == []
+        assert index.elements_of_type(-10) == [element]
+
+        index.remove(element)
+        assert index.elements_of_type(-10) == []
+
+    def test_cells_without_value_type(self):
+        cells = etree.fromstring(
+            b'<gnm:Cells xmlns:gnm="http://www.gnumeric.org/v10.dtd">'
+            b'<gnm:Cell Row="0" Col="0" ExprID="1"/>'
+            b'<gnm:Cell Row="0" Col="1"/>'
+            b'</gnm:Cells>'
+        )
+        index = CellIndex(cells, ALL_NAMESPACES)
+        assert index.elements_of_type(-10) == [index.get(0, 0)]
+        assert index.elements_of_type(10) == [index.get(0, 1)]
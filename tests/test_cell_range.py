@@ -0,0 +1,81 @@
+"""
+Gnumeric-py: Reading and writing gnumeric files with python
+Copyright (C) 2017 Michael Lipschultz
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import pytest
+
+from gnumeric.cell_range import CellRange
+from gnumeric.workbook import Workbook
+
+
+@pytest.fixture
+def worksheet():
+    ws = Workbook().create_sheet('Title')
+    ws.write_rows([[1, 2, 3], [None, 5, None], [7, 8, 9]])
+    return ws
+
+
+class TestCellRange:
+    def test_range_from_spreadsheet_notation(self, worksheet):
+        cell_range = worksheet['A1:C2']
+        assert isinstance(cell_range, CellRange)
+        assert cell_range.shape == (2, 3)
+        assert str(cell_range) == 'A1:C2'
+
+    def test_range_from_slices(self, worksheet):
+        cell_range = worksheet[1:3, 0:2]
+        assert cell_range.shape == (2, 2)
+        assert str(cell_range) == 'A2:B3'
+
+    def test_values(self, worksheet):
+        assert list(worksheet['A1:C3'].values()) == [
+            (1, 2, 3),
+            (None, 5, None),
+            (7, 8, 9),
+        ]
+
+    def test_rows_use_virtual_cells_for_missing_cells(self, worksheet):
+        rows = list(worksheet['A2:C2'].rows())
+        assert [c.is_virtual for c in rows[0]] == [True, False, True]
+        assert len(worksheet.get_cell_collection(include_empty=True)) == 7
+
+    def test_columns(self, worksheet):
+        columns = list(worksheet['B1:C3'].columns())
+        assert [[c.value for c in col] for col in columns] == [
+            [2, 5, 8],
+            [3, None, 9],
+        ]
+
+    def test_range_beyond_content(self, worksheet):
+        assert list(worksheet['C3:D4'].values()) == [(9, None), (None, None)]
+
+    def test_range_is_lazy(self, worksheet):
+        cell_range = worksheet['A1:A2']
+        worksheet.cell(1, 0).value = 4
+        assert list(cell_range.values()) == [(1,), (4,)]
+
+    def test_iterating_yields_rows(self, worksheet):
+        cell_range = worksheet['A1:B2']
+        assert len(cell_range) == 2
+        assert [tuple(c.value for c in row) for row in cell_range] == [
+            (1, 2),
+            (None, 5),
+        ]
+
+    def test_range_out_of_bounds_raises_error(self, worksheet):
+        with pytest.raises(IndexError):
+            worksheet[0:1, 0 : worksheet.max_allowed_column + 2]
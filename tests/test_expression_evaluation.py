@@ -20,7 +20,12 @@ import pytest
 
 from gnumeric import Workbook
 from gnumeric.evaluation_errors import EvaluationError
-from gnumeric.expression_evaluation import evaluate, get_referenced_cells
+from gnumeric.expression_evaluation import (
+    evaluate,
+    get_referenced_cells,
+    map_references,
+    translate_references,
+)
 
 
 @pytest.fixture()
@@ -538,3 +543,62 @@ class TestFunctionEvaluation:
     )
     def test_len(self, formula, expected):
         assert expected == evaluate(formula, self.ANY_CELL)
+
+
+class TestReferenceRewriting:
+    @pytest.mark.parametrize(
+        'formula, expected',
+        [
+            ('=A1+$B$2*C$3+$D4', '=B3+$B$2*D$3+$D6'),
+            ('=SUM(A1:B2)', '=SUM(B3:C4)'),
+            ('=LOG10(A1)', '=LOG10(B3)'),
+            ('="A1"&A1', '="A1"&B3'),
+            ("=Sheet2!A1+'My Sheet'!$A1", "=Sheet2!B3+'My Sheet'!$A3"),
+            ('=1E10+A1', '=1E10+B3'),
+            ('=SUM(Sheet2!A1:$B2)', '=SUM(Sheet2!B3:$B4)'),
+        ],
+    )
+    def test_translate_references(self, formula, expected):
+        assert translate_references(formula, 2, 1) == expected
+
+    def test_translate_references_off_the_sheet_become_ref_errors(self):
+        assert translate_references('=A1+$A$1', -1, 0) == '=#REF!+$A$1'
+
+    def test_map_references_gets_sheet_names(self):
+        seen = []
+
+        def record(sheet, row, col, row_fixed, col_fixed):
+            seen.append((sheet, row, col, row_fixed, col_fixed))
+            return row, col
+
+        assert map_references("=A$2+'My Sheet'!$C3", record) == "=A$2+'My Sheet'!$C3"
+        assert seen == [(None, 1, 0, True, False), ('My Sheet', 2, 2, False, True)]
+
+    def test_map_references_gets_ranges_as_a_whole(self):
+        seen = []
+
+        def record_range(sheet, start_row, start_col, end_row, end_col):
+            seen.append((sheet, start_row, start_col, end_row, end_col))
+            return start_row, start_col, end_row + 1, end_col
+
+        def fail(*args):
+            raise AssertionError('Only ranges in the expression')
+
+        assert (
+            map_references("=SUM(A$1:B2)+'My Sheet'!C3:D4", fail, record_range)
+            == "=SUM(A$1:B3)+'My Sheet'!C3:D5"
+        )
+        assert seen == [(None, 0, 0, 1, 1), ('My Sheet', 2, 2, 3, 3)]
+
+    def test_range_ends_get_the_range_sheet_name(self):
+        seen = []
+
+        def record(sheet, row, col, row_fixed, col_fixed):
+            seen.append(sheet)
+            return row, col
+
+        map_references('=SUM(Other!A1:A5)', record)
+        assert seen == ['Other', 'Other']
+
+    def test_range_with_end_off_the_sheet_becomes_ref_error(self):
+        assert translate_references('=SUM(A1:$A$5)', -1, 0) == '=SUM(#REF!)'
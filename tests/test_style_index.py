@@ -0,0 +1,67 @@
+"""
+Gnumeric-py: Reading and writing gnumeric files with python
+Copyright (C) 2017 Michael Lipschultz
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program. If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from lxml import etree
+
+from gnumeric.style_index import StyleIndex
+from gnumeric.workbook import ALL_NAMESPACES
+
+STYLES = b"""<gnm:Styles xmlns:gnm="http://www.gnumeric.org/v10.dtd">
+<gnm:StyleRegion startCol="0" startRow="0" endCol="0" endRow="1" id="a"/>
+<gnm:StyleRegion startCol="0" startRow="2" endCol="255" endRow="65535" id="b"/>
+<gnm:StyleRegion startCol="1" startRow="0" endCol="1" endRow="1" id="c"/>
+<gnm:StyleRegion startCol="2" startRow="0" endCol="255" endRow="1" id="d"/>
+</gnm:Styles>"""
+
+
+class TestStyleIndex:
+    def test_find_region_covering_cell(self):
+        index = StyleIndex(etree.fromstring(STYLES), ALL_NAMESPACES)
+        assert index.find(0, 0).get('id') == 'a'
+        assert index.find(1, 1).get('id') == 'c'
+        assert index.find(1, 200).get('id') == 'd'
+        assert index.find(2, 0).get('id') == 'b'
+        assert index.find(65535, 255).get('id') == 'b'
+
+    def test_cell_outside_all_regions(self):
+        index = StyleIndex(etree.fromstring(STYLES), ALL_NAMESPACES)
+        assert index.find(65536, 0) is None
+        assert index.find(0, 256) is None
+
+    def test_many_staggered_regions(self):
+        # Every column is split into 20 regions, at rows that differ from column to column, so almost every region
+        # starts or ends in a row band of its own
+        styles = etree.Element('{%s}Styles' % ALL_NAMESPACES['gnm'])
+        expected = {}
+        for col in range(256):
+            splits = [0] + [i * 3000 + col for i in range(1, 20)] + [65536]
+            for start, end in zip(splits, splits[1:]):
+                region = etree.SubElement(
+                    styles,
+                    '{%s}StyleRegion' % ALL_NAMESPACES['gnm'],
+                    startCol=str(col),
+                    endCol=str(col),
+                    startRow=str(start),
+                    endRow=str(end - 1),
+                )
+                expected[(start, col)] = expected[(end - 1, col)] = region
+
+        index = StyleIndex(styles, ALL_NAMESPACES)
+        for (row, col), region in expected.items():
+            assert index.find(row, col) is region
+        assert index.find(65536, 0) is None
@@ -88,3 +88,12 @@ class TestBasicUtility:
 
     def test_coordinate_from_spreadsheet(self):
         assert utils.coordinate_from_spreadsheet('AE$18') == (17, 30)
+
+    def test_range_from_spreadsheet(self):
+        assert utils.range_from_spreadsheet('A1:D$10') == ((0, 0), (9, 3))
+
+    def test_range_from_spreadsheet_orders_corners(self):
+        assert utils.range_from_spreadsheet('D1:A10') == ((0, 0), (9, 3))
+
+    def test_range_from_spreadsheet_with_single_coordinate(self):
+        assert utils.range_from_spreadsheet('B3') == ((2, 1), (2, 1))
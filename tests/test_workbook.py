@@ -147,6 +147,27 @@ class TestWorkbook:
         ws = workbook.get_sheet_by_name('Title' + str(index))
         assert ws == worksheets[index]
 
+    def test_getting_same_sheet_twice_returns_same_object(self):
+        workbook = Workbook.load_workbook(TEST_GNUMERIC_FILE_PATH)
+        assert workbook.get_sheet_by_index(2) is workbook.get_sheet_by_index(2)
+        assert workbook.get_sheet_by_name('Sheet1') is workbook[0]
+
+    def test_getting_sheet_by_name_after_renaming(self):
+        workbook = Workbook()
+        worksheets = [workbook.create_sheet('Title' + str(i)) for i in range(3)]
+        worksheets[1].title = 'Renamed'
+        assert workbook.get_sheet_by_name('Renamed') is worksheets[1]
+        with pytest.raises(KeyError):
+            workbook.get_sheet_by_name('Title1')
+
+    def test_getting_sheet_by_name_after_inserting_and_removing_sheets(self):
+        workbook = Workbook()
+        worksheets = [workbook.create_sheet('Title' + str(i)) for i in range(3)]
+        workbook.create_sheet('First', index=0)
+        workbook.remove_sheet(worksheets[1])
+        assert workbook.get_index(worksheets[2]) == 2
+        assert workbook.get_sheet_by_name('Title2') is worksheets[2]
+
     def test_getting_sheet_with_nonexistent_name_raises_exception(self):
         workbook = Workbook()
         for i in range(5):
@@ -365,6 +386,18 @@ class TestWorkbook:
         workbook.set_active_sheet(ws)
         assert workbook.get_active_sheet() == ws
 
+    def test_batch_covers_every_worksheet(self):
+        workbook = Workbook()
+        ws1 = workbook.create_sheet('Sheet1')
+        ws2 = workbook.create_sheet('Sheet2')
+        with workbook.batch():
+            assert ws1._in_batch and ws2._in_batch
+            ws2['A1'] = '=Sheet1!A1+1'
+            ws1['A1'] = 1
+
+        assert not ws1._in_batch and not ws2._in_batch
+        assert ws2['A1'].result == 2
+
 
 class TestWorkbookSave:
     def test_saving_compressed_file(self, monkeypatch):